@@ -0,0 +1,220 @@
+# Code to build the materialized per-actor profile table
+# Joins the Threat Actor Collection with the Information Retrieval Collection
+# One row per canonical threat actor, updated incrementally as reports are appended
+
+import os
+import json
+import hashlib
+import argparse
+import numpy as np
+import pandas as pd
+
+from incremental import appended_rows
+from multi_value import explode_column
+
+INPUT_CSV = '../Information_Retrieved_Collection.csv'
+ACTOR_CSV = '../Threat_Actor_Collection.csv'
+OUTPUT_CSV = 'Actor_Profiles.csv'
+CACHE_FILE = '.actor_profiles_cache.pkl'
+
+# Helper function to map every lower-case name and alias to its canonical actor
+def build_alias_map(actor_csv):
+    actors = pd.read_csv(actor_csv)
+    alias_map = {}
+    for name, other_names in zip(actors['Threat Actor'], actors['Other Names']):
+        if isinstance(other_names, str):
+            for alias in other_names.split(','):
+                alias_map.setdefault(alias.strip().lower(), name)
+
+    # Actor names take precedence over aliases shared by several actors
+    for name in actors['Threat Actor']:
+        alias_map[name.strip().lower()] = name
+
+    return alias_map
+
+'''
+Function to process the report rows into mergeable per-actor partial aggregates
+Every table is a count or a min/max, so partials of appended rows fold into the previous ones
+'''
+def process_filter_data(df, alias_map):
+    # ------------------------------
+    # Load and Prepare Data
+    # ------------------------------
+    df = df.reset_index(drop=True)
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    df['Year'] = df['Date'].dt.year
+    df['Zero-day'] = np.where(df['Zero-day'].astype(str).str.lower() == 'true', 1, 0)
+    df['First_seen'] = pd.to_numeric(df['First_seen'], errors='coerce')
+
+    # ------------------------------
+    # Resolve the canonical actors
+    # ------------------------------
+    actors = explode_column(df, 'Threat_actor')
+    actors['Actor'] = actors['Threat_actor'].map(alias_map).fillna(actors['Threat_actor'])
+    actors = actors[['index', 'Actor']].drop_duplicates()
+
+    rows = actors.join(df[['Date', 'Year', 'Zero-day', 'First_seen']], on='index')
+
+    summary = rows.groupby('Actor').agg(
+        FirstReport=('Date', 'min'),
+        LastReport=('Date', 'max'),
+        Reports=('index', 'count'),
+        ZeroDayReports=('Zero-day', 'sum'),
+        ReportedFirstSeen=('First_seen', 'min')
+    )
+
+    # ------------------------------
+    # Count the multi-value columns per actor
+    # ------------------------------
+    def count_by_actor(col, sep=','):
+        items = explode_column(df, col, sep).merge(actors, on='index')
+        return items.groupby(['Actor', col]).size().rename('Count')
+
+    return {
+        'summary': summary,
+        'years': rows.dropna(subset=['Year']).astype({'Year': int}).groupby(['Actor', 'Year']).size().rename('Count'),
+        'malware': count_by_actor('Malware'),
+        'cves': count_by_actor('CVE'),
+        'victims': count_by_actor('Victim_country'),
+        'countries': count_by_actor('Threat_country', ';')
+    }
+
+# Function to fold the partial aggregates of appended rows into the previous ones
+def merge_partials(old, new):
+    summary = pd.concat([old['summary'], new['summary']]).groupby(level=0).agg({
+        'FirstReport': 'min',
+        'LastReport': 'max',
+        'Reports': 'sum',
+        'ZeroDayReports': 'sum',
+        'ReportedFirstSeen': 'min'
+    })
+    merged = {'summary': summary}
+    for key in ('years', 'malware', 'cves', 'victims', 'countries'):
+        merged[key] = pd.concat([old[key], new[key]]).groupby(level=[0, 1]).sum()
+    return merged
+
+# Helper function to format a per-actor count series as "item:count" pairs, most frequent first or in item order
+def format_counts(counts, by_item=False):
+    counts = counts.reset_index()
+    counts.columns = ['Actor', 'Item', 'Count']
+    if by_item:
+        counts = counts.sort_values(['Actor', 'Item'], kind='mergesort')
+    else:
+        counts = counts.sort_values(['Actor', 'Count', 'Item'], ascending=[True, False, True], kind='mergesort')
+    return counts.groupby('Actor')[['Item', 'Count']].apply(
+        lambda g: json.dumps(dict(zip(g['Item'].astype(str), g['Count'].astype(int))))
+    )
+
+'''
+Function to materialize the profile table from the partial aggregates
+Adds the Threat Actor Collection attributes and the first-seen to first-report lag
+'''
+def build_profiles(partials, actor_csv):
+    profiles = partials['summary'].copy()
+
+    # ------------------------------
+    # Join the Threat Actor Collection
+    # ------------------------------
+    actors = pd.read_csv(actor_csv).drop_duplicates('Threat Actor').set_index('Threat Actor')
+    profiles = profiles.join(actors[['Country', 'Sponsor', 'Motivation', 'First seen']])
+
+    # Actors missing from the collection fall back to the attribution in the reports
+    reported_country = (
+        partials['countries'].reset_index()
+        .sort_values(['Actor', 'Count'], ascending=[True, False], kind='mergesort')
+        .drop_duplicates('Actor').set_index('Actor')['Threat_country']
+    )
+    profiles['Country'] = profiles['Country'].fillna(reported_country)
+    profiles['First seen'] = profiles['First seen'].fillna(profiles['ReportedFirstSeen'])
+    profiles['FirstSeenToFirstReportYears'] = profiles['FirstReport'].dt.year - profiles['First seen']
+
+    # ------------------------------
+    # Add the distributions and sets
+    # ------------------------------
+    # Years stay in chronological order, so the per-year series can be read as is
+    profiles['ReportsPerYear'] = format_counts(partials['years'], by_item=True)
+    profiles['VictimCountries'] = format_counts(partials['victims'])
+    for key, col in (('malware', 'Malware'), ('cves', 'CVEs')):
+        items = partials[key].reset_index()
+        items.columns = ['Actor', 'Item', 'Count']
+        profiles[col] = items.groupby('Actor')['Item'].apply(lambda s: json.dumps(sorted(s.astype(str))))
+        profiles[f'Distinct{col}'] = items.groupby('Actor').size()
+
+    profiles[['DistinctMalware', 'DistinctCVEs']] = profiles[['DistinctMalware', 'DistinctCVEs']].fillna(0).astype(int)
+    profiles = profiles.drop(columns=['ReportedFirstSeen']).rename_axis('Actor')
+
+    return profiles.sort_values(['Reports', 'Actor'], ascending=[False, True], kind='mergesort')
+
+'''
+Function to load or refresh the materialized profiles
+Only the report rows appended since the cached run are aggregated
+'''
+def refresh_profiles(input_csv, actor_csv, cache_file=CACHE_FILE):
+    df = pd.read_csv(input_csv, dtype=str)
+    with open(actor_csv, 'rb') as f:
+        actor_digest = hashlib.sha256(f.read()).hexdigest()
+
+    cache = pd.read_pickle(cache_file) if cache_file and os.path.exists(cache_file) else None
+
+    n_cached, rows_state = appended_rows(df, cache)
+    reusable = n_cached is not None and cache['actor_digest'] == actor_digest
+
+    if reusable and n_cached == len(df):
+        return cache['profiles']
+
+    alias_map = build_alias_map(actor_csv)
+    if reusable:
+        partials = merge_partials(cache['partials'], process_filter_data(df.iloc[n_cached:], alias_map))
+    else:
+        partials = process_filter_data(df, alias_map)
+
+    profiles = build_profiles(partials, actor_csv)
+
+    if cache_file:
+        pd.to_pickle({
+            **rows_state,
+            'actor_digest': actor_digest,
+            'partials': partials,
+            'profiles': profiles
+        }, cache_file)
+
+    return profiles
+
+'''
+In-memory lookup over the materialized profiles
+Resolves actor names and aliases case-insensitively with a single dictionary access
+'''
+class ActorProfiles:
+    def __init__(self, profiles, alias_map):
+        self.profiles = profiles
+        records = profiles.reset_index().to_dict('records')
+        self._by_actor = {record['Actor']: record for record in records}
+        self._aliases = {alias: actor for alias, actor in alias_map.items() if actor in self._by_actor}
+        self._aliases.update({actor.lower(): actor for actor in self._by_actor})
+
+    @classmethod
+    def load(cls, input_csv=INPUT_CSV, actor_csv=ACTOR_CSV, cache_file=CACHE_FILE):
+        return cls(refresh_profiles(input_csv, actor_csv, cache_file), build_alias_map(actor_csv))
+
+    def get(self, name):
+        actor = self._aliases.get(name.strip().lower())
+        return self._by_actor.get(actor)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build the materialized per-actor profile table')
+    parser.add_argument('--input', default=INPUT_CSV)
+    parser.add_argument('--actors', default=ACTOR_CSV)
+    parser.add_argument('--output', default=OUTPUT_CSV)
+    parser.add_argument('--actor', help='print the profile of one actor (name or alias)')
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args()
+
+    cache_file = None if args.no_cache else CACHE_FILE
+
+    if args.actor:
+        profile = ActorProfiles.load(args.input, args.actors, cache_file).get(args.actor)
+        print(json.dumps(profile, default=str, indent=2) if profile else f"[!] Unknown threat actor: {args.actor}")
+    else:
+        profiles = refresh_profiles(args.input, args.actors, cache_file)
+        profiles.to_csv(args.output, date_format='%Y-%m-%d')
+        print(f"[✓] {len(profiles)} actor profiles saved to {args.output}")
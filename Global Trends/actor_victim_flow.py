@@ -0,0 +1,230 @@
+# Code to generate the data of the threat actor - victim country flow diagram
+# Top 10 threat actors and the 30 most frequently targeted countries
+# See "Visual Representations: Threat Actor - Victim Country Flow Diagram" in the README
+
+import os
+import html
+import argparse
+import numpy as np
+import pandas as pd
+
+from incremental import appended_rows
+from multi_value import explode_column
+
+INPUT_CSV = '../Information_Retrieved_Collection.csv'
+OUTPUT_PREFIX = 'Flow_ActorVictim'
+CACHE_FILE = '.actor_victim_flow_cache.pkl'
+
+'''
+Function to process the original data and count every actor-country pair per year
+Years, actors and countries are integer-coded into one key per pair, and only the keys that occur are counted
+'''
+def count_pairs(df):
+    # ------------------------------
+    # Explode actors and victims
+    # ------------------------------
+    df = df.reset_index(drop=True)
+    year = pd.to_datetime(df['Date'], errors='coerce').dt.year
+
+    actors = explode_column(df, 'Threat_actor')
+    victims = explode_column(df, 'Victim_country')
+    pairs = actors.merge(victims, on='index')
+    pairs['Year'] = year.reindex(pairs['index']).to_numpy()
+    pairs = pairs.dropna(subset=['Year'])
+
+    if pairs.empty:
+        return pd.DataFrame(columns=['Year', 'Threat_actor', 'Victim_country', 'Value'])
+
+    # ------------------------------
+    # Integer-coded group-by
+    # ------------------------------
+    year_codes, year_values = pd.factorize(pairs['Year'].astype(int))
+    actor_codes, actor_values = pd.factorize(pairs['Threat_actor'])
+    country_codes, country_values = pd.factorize(pairs['Victim_country'])
+
+    n_actor, n_country = len(actor_values), len(country_values)
+    keys = (year_codes.astype(np.int64) * n_actor + actor_codes) * n_country + country_codes
+    unique_keys, counts = np.unique(keys, return_counts=True)
+
+    year_idx, rest = np.divmod(unique_keys, n_actor * n_country)
+    actor_idx, country_idx = np.divmod(rest, n_country)
+
+    return pd.DataFrame({
+        'Year': np.asarray(year_values)[year_idx],
+        'Threat_actor': np.asarray(actor_values)[actor_idx],
+        'Victim_country': np.asarray(country_values)[country_idx],
+        'Value': counts
+    })
+
+'''
+Function to load the yearly pair counts, reusing the cache when reports were only appended
+Only the rows added since the cached run are exploded and counted
+'''
+def process_filter_data(input_csv, cache_file=CACHE_FILE):
+    # ------------------------------
+    # Load and Prepare Data
+    # ------------------------------
+    df = pd.read_csv(input_csv, dtype=str)
+
+    cache = pd.read_pickle(cache_file) if cache_file and os.path.exists(cache_file) else None
+
+    # ------------------------------
+    # Count only the appended rows
+    # ------------------------------
+    n_cached, rows_state = appended_rows(df, cache)
+    if n_cached is not None:
+        new_counts = count_pairs(df.iloc[n_cached:])
+        counts = pd.concat([cache['counts'], new_counts], ignore_index=True)
+        counts = counts.groupby(['Year', 'Threat_actor', 'Victim_country'], as_index=False)['Value'].sum()
+    else:
+        counts = count_pairs(df)
+
+    if cache_file:
+        pd.to_pickle({
+            **rows_state,
+            'counts': counts
+        }, cache_file)
+
+    return counts
+
+'''
+Function to build the Sankey node and link tables
+Keeps the top N threat actors and the top M victim countries within the selected years
+Both are ranked on all the flows of those years, so the countries are the most targeted overall,
+not only by the selected actors; countries none of these actors targeted are left out
+'''
+def build_flow(counts, top_actors=10, top_countries=30, start_year=None, end_year=None):
+    # ------------------------------
+    # Filter the years
+    # ------------------------------
+    if start_year is not None:
+        counts = counts[counts['Year'] >= start_year]
+    if end_year is not None:
+        counts = counts[counts['Year'] <= end_year]
+
+    flows = counts.groupby(['Threat_actor', 'Victim_country'], as_index=False)['Value'].sum()
+
+    # ------------------------------
+    # Select the top actors and countries
+    # ------------------------------
+    actor_totals = (
+        flows.groupby('Threat_actor')['Value'].sum().rename_axis('Name').reset_index()
+        .sort_values(['Value', 'Name'], ascending=[False, True], kind='mergesort').head(top_actors)
+    )
+    country_totals = (
+        flows.groupby('Victim_country')['Value'].sum().rename_axis('Name').reset_index()
+        .sort_values(['Value', 'Name'], ascending=[False, True], kind='mergesort').head(top_countries)
+    )
+    flows = flows[flows['Threat_actor'].isin(actor_totals['Name']) & flows['Victim_country'].isin(country_totals['Name'])]
+
+    # ------------------------------
+    # Create the node and link tables
+    # ------------------------------
+    actor_totals = flows.groupby('Threat_actor')['Value'].sum().reindex(actor_totals['Name']).dropna()
+    country_totals = flows.groupby('Victim_country')['Value'].sum().reindex(country_totals['Name']).dropna()
+
+    nodes = pd.concat([
+        pd.DataFrame({'Name': actor_totals.index, 'Group': 'Threat Actor', 'Value': actor_totals.to_numpy()}),
+        pd.DataFrame({'Name': country_totals.index, 'Group': 'Victim Country', 'Value': country_totals.to_numpy()})
+    ], ignore_index=True)
+    nodes['Value'] = nodes['Value'].astype(int)
+    nodes.insert(0, 'Id', range(len(nodes)))
+
+    n_actors = len(actor_totals)
+    actor_ids = dict(zip(actor_totals.index, range(n_actors)))
+    country_ids = dict(zip(country_totals.index, range(n_actors, len(nodes))))
+
+    links = pd.DataFrame({
+        'Source': flows['Threat_actor'].map(actor_ids).to_numpy(),
+        'Target': flows['Victim_country'].map(country_ids).to_numpy(),
+        'Value': flows['Value'].astype(int).to_numpy()
+    }).sort_values(['Source', 'Target'], kind='mergesort').reset_index(drop=True)
+
+    return nodes, links
+
+'''
+Function to draw a static Sankey diagram as SVG
+Actors on the left, countries on the right, band widths proportional to the flows
+'''
+def draw_svg(nodes, links, width=1200, height=1400, node_width=18, gap=6, margin=160):
+    palette = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+               '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
+
+    # ------------------------------
+    # Lay out the nodes of each side
+    # ------------------------------
+    positions = {}
+    for group, x in (('Threat Actor', margin), ('Victim Country', width - margin - node_width)):
+        side = nodes[nodes['Group'] == group]
+        scale = (height - 40 - gap * (len(side) - 1)) / max(side['Value'].sum(), 1)
+        y = 20
+        for node_id, value in zip(side['Id'], side['Value']):
+            positions[node_id] = [x, y, value * scale, y, y]
+            y += value * scale + gap
+
+    # ------------------------------
+    # Draw the links as bands
+    # ------------------------------
+    elements = []
+    for source, target, value in links.itertuples(index=False):
+        sx, _, s_height, _, s_offset = positions[source]
+        tx, _, t_height, _, t_offset = positions[target]
+        band = value * s_height / nodes.loc[source, 'Value']
+        positions[source][4] += band
+        positions[target][4] += band
+
+        x0, x1 = sx + node_width, tx
+        xm = (x0 + x1) / 2
+        color = palette[source % len(palette)]
+        elements.append(
+            f'<path d="M{x0:.1f},{s_offset:.1f} C{xm:.1f},{s_offset:.1f} {xm:.1f},{t_offset:.1f} {x1:.1f},{t_offset:.1f} '
+            f'L{x1:.1f},{t_offset + band:.1f} C{xm:.1f},{t_offset + band:.1f} {xm:.1f},{s_offset + band:.1f} {x0:.1f},{s_offset + band:.1f} Z" '
+            f'fill="{color}" fill-opacity="0.45"><title>{html.escape(nodes.loc[source, "Name"])} → {html.escape(nodes.loc[target, "Name"])}: {value}</title></path>'
+        )
+
+    # ------------------------------
+    # Draw the nodes and labels
+    # ------------------------------
+    for node_id, name, group in zip(nodes['Id'], nodes['Name'], nodes['Group']):
+        x, y, h, _, _ = positions[node_id]
+        left = group == 'Threat Actor'
+        color = palette[node_id % len(palette)] if left else '#555555'
+        label_x = x - 8 if left else x + node_width + 8
+        anchor = 'end' if left else 'start'
+        elements.append(f'<rect x="{x:.1f}" y="{y:.1f}" width="{node_width}" height="{max(h, 1):.1f}" fill="{color}"/>')
+        elements.append(
+            f'<text x="{label_x:.1f}" y="{y + h / 2:.1f}" text-anchor="{anchor}" dominant-baseline="middle" '
+            f'font-family="Arial, sans-serif" font-size="16" font-weight="bold">{html.escape(name)}</text>'
+        )
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        + ''.join(elements) + '</svg>'
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate the threat actor - victim country flow diagram data')
+    parser.add_argument('--input', default=INPUT_CSV)
+    parser.add_argument('--output', default=OUTPUT_PREFIX, help='prefix of the output files')
+    parser.add_argument('--top-actors', type=int, default=10)
+    parser.add_argument('--top-countries', type=int, default=30)
+    parser.add_argument('--start-year', type=int)
+    parser.add_argument('--end-year', type=int)
+    parser.add_argument('--svg', action='store_true', help='also write a static SVG and HTML rendering')
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args()
+
+    counts = process_filter_data(args.input, None if args.no_cache else CACHE_FILE)
+    nodes, links = build_flow(counts, args.top_actors, args.top_countries, args.start_year, args.end_year)
+
+    nodes.to_csv(f'{args.output}_nodes.csv', index=False)
+    links.to_csv(f'{args.output}_links.csv', index=False)
+    print(f"[✓] Flow nodes and links saved to {args.output}_nodes.csv and {args.output}_links.csv")
+
+    if args.svg:
+        svg = draw_svg(nodes, links)
+        with open(f'{args.output}.svg', 'w', encoding='utf-8') as f:
+            f.write(svg)
+        with open(f'{args.output}.html', 'w', encoding='utf-8') as f:
+            f.write(f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>Threat Actor - Victim Country Flow</title></head><body>{svg}</body></html>')
+        print(f"[✓] Flow diagram saved to {args.output}.svg and {args.output}.html")
@@ -4,20 +4,19 @@
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
 INPUT_CSV = '../Information_Retrieved_Collection.csv'
 OUTPUT_PDF = 'Figure6_AttackDurationCDF.pdf' 
 
 '''
 Function to process the original data and filter to the attack durations
-Draws a histogram and CDF of the attack durations
+Returns the sorted durations with their CDF
 '''
-def process_data_and_draw(input_csv, col):
+def process_filter_data(input_csv, col):
     # ------------------------------
     # Load and Prepare Data
     # ------------------------------
-    df = pd.read_csv(input_csv)
+    df = input_csv.copy() if isinstance(input_csv, pd.DataFrame) else pd.read_csv(input_csv)
 
     duration_df = df.loc[pd.notna(df[col]), col]
 
@@ -25,6 +24,18 @@ def process_data_and_draw(input_csv, col):
     sorted_durations = np.sort(duration_df)
     cdf = np.arange(1, len(sorted_durations) + 1) / len(sorted_durations)
 
+    return pd.DataFrame({'Duration': sorted_durations, 'CDF': cdf})
+
+'''
+Function to draw the figure
+Draws a histogram and CDF of the attack durations
+'''
+def draw_figure(input_df):
+    import matplotlib.pyplot as plt
+
+    sorted_durations = input_df['Duration'].to_numpy()
+    cdf = input_df['CDF'].to_numpy()
+
     # ------------------------------
     # Create a figure with twin axes:
     # Histogram and CDF
@@ -82,4 +93,5 @@ def process_data_and_draw(input_csv, col):
     print(f"[✓] Figure 6 plot saved to {OUTPUT_PDF}")
 
 if __name__ == '__main__':
-    process_data_and_draw(INPUT_CSV, 'Attack_duration')
\ No newline at end of file
+    final_df = process_filter_data(INPUT_CSV, 'Attack_duration')
+    draw_figure(final_df)
\ No newline at end of file
@@ -3,10 +3,6 @@
 # Section 4.3: Two-sided Nature as Both Attacker and Victim and Self-directed APT Attacks
 
 import pandas as pd
-import seaborn as sns
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-from matplotlib.colors import LinearSegmentedColormap
 
 INPUT_CSV = '../Information_Retrieved_Collection.csv'
 OUTPUT_PDF = 'Figure8_Heatmap.pdf' 
@@ -19,7 +15,7 @@ def process_filter_data(input_csv):
     # ------------------------------
     # Load and Prepare Data
     # ------------------------------
-    df = pd.read_csv(input_csv)
+    df = input_csv.copy() if isinstance(input_csv, pd.DataFrame) else pd.read_csv(input_csv)
     
     df.replace('NaN', pd.NA, inplace=True)
     df = df.dropna(subset=['Threat_country'])
@@ -63,10 +59,8 @@ def process_filter_data(input_csv):
     
     return final_df
 
-# Function to draw the figure
-def draw_figure(input_df):
-    mpl.rcParams['font.family'] = 'Liberation Sans'
-
+# Function to pivot the pairs into a square attacker x victim matrix
+def build_pivot(input_df):
     # Rename columns
     df = input_df.rename(columns={
         "Threat_country": "AttackerCol",
@@ -91,6 +85,19 @@ def draw_figure(input_df):
     )
     data_pivot = data_pivot.reindex(index=all_attackers, columns=all_attackers, fill_value=0)
 
+    return data_pivot
+
+# Function to draw the figure
+def draw_figure(input_df):
+    import seaborn as sns
+    import matplotlib as mpl
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import LinearSegmentedColormap
+
+    mpl.rcParams['font.family'] = 'Liberation Sans'
+
+    data_pivot = build_pivot(input_df)
+
     # Define custom colormap: white (low) to red (high)
     cmap = LinearSegmentedColormap.from_list("white_red", ["white", "red"])
 
@@ -0,0 +1,324 @@
+# Code to render many variants of Figures 5(a), 5(b) and 8 in one run
+# e.g. one page per year range or per victim region
+# The styled figure is built once per figure type, and only the data artists are swapped for each variant
+
+import os
+import json
+import time
+import argparse
+import numpy as np
+import pandas as pd
+import seaborn as sns
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.colors import LinearSegmentedColormap
+from seaborn.utils import relative_luminance
+
+import overtime_changes_attack_vectors as vectors_figure
+import overtime_changes_target_sectors as sectors_figure
+import attacker_victim_relationship as heatmap_figure
+
+INPUT_CSV = '../Information_Retrieved_Collection.csv'
+OUTPUT_PDF = 'Figure_Variants.pdf'
+
+STACKED_FIGURES = {
+    'Figure5a': (sectors_figure, 'Target_sector', 'Number of Target Sectors', 40),
+    'Figure5b': (vectors_figure, 'Attack_vector', 'Number of Attack Vectors', 42)
+}
+# Columns the three figures read, the only ones loaded from a partitioned dataset
+VARIANT_COLUMNS = ['Date', 'Target_sector', 'Attack_vector', 'Threat_country', 'Victim_country']
+
+# Helper function to keep the reports of a year range
+def filter_years(df, start, end):
+    years = pd.to_datetime(df['Date'], errors='coerce').dt.year
+    return df[(years >= start) & (years <= end)]
+
+# Helper function to keep the reports that target at least one country of a region
+def filter_victims(df, countries):
+    victims = df['Victim_country'].fillna('').str.split(',').apply(lambda items: {item.strip() for item in items})
+    return df[victims.apply(lambda items: not items.isdisjoint(countries))]
+
+'''
+Function to build the list of variants
+Every variant is a name and the subset of report rows it covers
+With a partitioned dataset, each year range reads only its own partitions
+'''
+def build_variants(df, year_ranges, regions, dataset=None):
+    variants = [('All', df)]
+    for year_range in year_ranges:
+        start, end = (int(year) for year in year_range.split('-'))
+        if dataset:
+            from partitioned_dataset import read_dataset
+            variant_df = read_dataset(dataset, VARIANT_COLUMNS, [('Year', '>=', start), ('Year', '<=', end)])
+        else:
+            variant_df = filter_years(df, start, end)
+        variants.append((f'{start}-{end}', variant_df))
+    for region, countries in regions.items():
+        variants.append((region, filter_victims(df, set(countries))))
+    return variants
+
+'''
+Stacked bar template of Figures 5(a) and 5(b)
+Bars, legend, labels and styling are created once, and render() only updates bar heights and percentage labels
+'''
+class StackedBarTemplate:
+    def __init__(self, module, full_df, ylabel, label_fontsize):
+        full_pivot = module.build_pivot(full_df)
+        self.years = full_pivot.index.tolist()
+        self.columns = full_pivot.columns.tolist()
+        x = np.arange(len(self.years))
+
+        plt.rcParams['font.family'] = 'sans-serif'
+        plt.rcParams['font.sans-serif'] = ['Arial']
+
+        # ------------------------------
+        # Create the empty stacked bar plot
+        # ------------------------------
+        self.fig, ax = plt.subplots(figsize=(30, 17))
+        self.ax = ax
+        self.bars = [
+            ax.bar(x, np.zeros(len(x)), width=0.5, color=color, label=column)
+            for column, color in zip(self.columns, module.build_colors(self.columns))
+        ]
+
+        ax.set_xlabel('Year', fontsize=56, fontweight='bold')
+        ax.set_ylabel(ylabel, fontsize=56, fontweight='bold')
+        ax.set_xticks(x, labels=[str(year) for year in self.years], rotation=0, fontweight='bold')
+
+        # Add a legend below the plot
+        legend = ax.legend(
+            bbox_to_anchor=(0.5, -0.4),
+            loc='center',
+            fontsize=45,
+            frameon=False,
+            ncol=3
+        )
+        for text in legend.get_texts():
+            text.set_fontweight('bold')
+
+        # Percentage labels of the top 3 segments of each bar, reused by every variant
+        self.labels = [
+            [ax.text(i, 0, '', ha='center', va='center', fontsize=label_fontsize, fontweight='bold', color='white')
+             for _ in range(3)]
+            for i in x
+        ]
+
+        for spine in ax.spines.values():
+            spine.set_linewidth(3)
+            spine.set_color('black')
+
+        ax.tick_params(
+            axis='both',
+            length=10,
+            width=2,
+            pad=10,
+            labelsize=52,
+            direction='out'
+        )
+
+        # Grid and spines
+        ax.set_axisbelow(True)
+        ax.grid(True, linestyle='--', axis='y', linewidth=3)
+        ax.xaxis.grid(False)
+        ax.patch.set_edgecolor('black')
+
+        # Variant name, reserved before the layout is computed
+        self.title = ax.set_title('All', fontsize=30, fontweight='bold')
+
+        self.render(full_pivot)
+        self.fig.tight_layout()
+
+    def render(self, pivot_df):
+        pivot_df = pivot_df.reindex(index=self.years, columns=self.columns, fill_value=0)
+        values = pivot_df.to_numpy(dtype=float)
+        bottoms = np.zeros(len(self.years))
+
+        # ------------------------------
+        # Swap the bar heights
+        # ------------------------------
+        for k, bars in enumerate(self.bars):
+            for rect, height, bottom in zip(bars.patches, values[:, k], bottoms):
+                rect.set_y(bottom)
+                rect.set_height(height)
+            bottoms = bottoms + values[:, k]
+
+        # ------------------------------
+        # Swap the percentage labels
+        # ------------------------------
+        starts = np.cumsum(values, axis=1) - values
+        for i, (_, row) in enumerate(pivot_df.iterrows()):
+            top3_this_year = [self.columns.index(c) for c in row.sort_values(ascending=False).head(3).index]
+            for text, k in zip(self.labels[i], top3_this_year):
+                height = values[i, k]
+                text.set_visible(height > 0)
+                if height > 0:
+                    text.set_y(starts[i, k] + height / 2)
+                    text.set_text(f"{(height / bottoms[i]) * 100:.0f}%")
+
+        # Year-range variants only show their own years
+        shown = np.flatnonzero(bottoms) if bottoms.any() else np.arange(len(self.years))
+        self.ax.set_xlim(shown[0] - 0.5, shown[-1] + 0.5)
+
+        top = max(bottoms.max(), 1)
+        step = 50 if top > 150 else 20 if top > 60 else 10 if top > 30 else 5
+        ticks = list(range(0, int(top) + step, step))
+        self.ax.set_ylim(0, top * 1.05)
+        self.ax.set_yticks(ticks, labels=[str(tick) for tick in ticks], fontweight='bold')
+
+        return self.fig
+
+'''
+Heatmap template of Figure 8
+The heatmap is drawn once with seaborn at the largest size, and render() swaps the cell values, annotations
+and country labels, then crops the axes to the countries of the variant, as draw_figure sizes it to the data
+'''
+class HeatmapTemplate:
+    SIZE = 20
+
+    def __init__(self):
+        mpl.rcParams['font.family'] = 'Liberation Sans'
+
+        self.cmap = LinearSegmentedColormap.from_list("white_red", ["white", "red"])
+        labels = [''] * self.SIZE
+        empty = pd.DataFrame(np.zeros((self.SIZE, self.SIZE), dtype=int), index=labels, columns=labels)
+
+        # ------------------------------
+        # Create the empty heatmap
+        # ------------------------------
+        self.fig = plt.figure(figsize=(13, 13))
+        ax = sns.heatmap(
+            empty,
+            cmap=self.cmap,
+            annot=True,
+            fmt="d",
+            linewidths=0,
+            linecolor='black',
+            vmin=0,
+            annot_kws={"size": 16, "ha": "center", "va": "center", "fontweight": "bold"},
+            cbar_kws={"label": "", "pad": 0.08}
+        )
+        self.ax = ax
+        self.mesh = ax.collections[0]
+        self.annotations = list(ax.texts)
+
+        for _, spine in ax.spines.items():
+            spine.set_visible(True)
+            spine.set_linewidth(2)
+
+        ax.set_xlabel('Victim Country', fontsize=22, fontweight='bold')
+        ax.set_ylabel('Attacker Country', fontsize=22, fontweight='bold')
+        ax.set_aspect('equal')
+
+        cbar = self.mesh.colorbar
+        cbar.ax.set_title('# of Cases', fontsize=18, weight='bold', loc='left')
+        cbar.ax.set_ylabel(' ', fontsize=15, weight='bold')
+        cbar.ax.set_position([0.75, 0.194, 0.03, 0.58])
+        cbar.ax.tick_params(labelsize=19)
+
+        self.title = ax.set_title('All', fontsize=30, fontweight='bold')
+
+    def render(self, data_pivot):
+        n = min(len(data_pivot), self.SIZE)
+        data_pivot = data_pivot.iloc[:n, :n]
+        labels = data_pivot.index.tolist() + [''] * (self.SIZE - n)
+
+        # Cells outside the countries of this variant stay blank
+        values = np.zeros((self.SIZE, self.SIZE))
+        values[:n, :n] = data_pivot.to_numpy()
+        mask = np.ones_like(values, dtype=bool)
+        mask[:n, :n] = False
+
+        # ------------------------------
+        # Swap the cell values
+        # ------------------------------
+        vmax = max(values.max(), 1)
+        self.mesh.set_array(np.ma.masked_array(values, mask).ravel())
+        self.mesh.set_clim(0, vmax)
+
+        # seaborn picks dark or white annotations from the luminance of the cell color
+        colors = self.cmap(values.ravel() / vmax)
+        for text, value, masked, color in zip(self.annotations, values.ravel(), mask.ravel(), colors):
+            text.set_text('' if masked else f'{int(value)}')
+            text.set_color('.15' if relative_luminance(color) > .408 else 'w')
+
+        # ------------------------------
+        # Swap the country labels and crop to n x n
+        # ------------------------------
+        ticks = np.arange(n) + 0.5
+        self.ax.set_xticks(ticks, labels=labels[:n], rotation=0, fontsize=16, fontweight='bold')
+        self.ax.set_yticks(ticks, labels=labels[:n], rotation=0, fontsize=16, fontweight='bold')
+        self.ax.set_xlim(0, max(n, 1))
+        self.ax.set_ylim(max(n, 1), 0)
+
+        return self.fig
+
+'''
+Function to render every variant of the selected figures
+Writes one multi-page PDF, or one image per variant into a directory
+'''
+def render_variants(df, variants, figures, output, image_format=None):
+    templates = {}
+    for figure in figures:
+        if figure in STACKED_FIGURES:
+            module, col, ylabel, label_fontsize = STACKED_FIGURES[figure]
+            templates[figure] = StackedBarTemplate(module, module.process_filter_data(df, col), ylabel, label_fontsize)
+        else:
+            templates[figure] = HeatmapTemplate()
+
+    pdf = None
+    if image_format:
+        os.makedirs(output, exist_ok=True)
+    else:
+        pdf = PdfPages(output)
+
+    rendered = 0
+    start = time.perf_counter()
+    for name, variant_df in variants:
+        for figure, template in templates.items():
+            # ------------------------------
+            # Aggregate the variant
+            # ------------------------------
+            if figure in STACKED_FIGURES:
+                module, col = STACKED_FIGURES[figure][:2]
+                fig = template.render(module.build_pivot(module.process_filter_data(variant_df, col)))
+            else:
+                fig = template.render(heatmap_figure.build_pivot(heatmap_figure.process_filter_data(variant_df)))
+
+            template.title.set_text(name)
+            if pdf is not None:
+                pdf.savefig(fig)
+            else:
+                fig.savefig(os.path.join(output, f'{figure}_{name}.{image_format}'), format=image_format)
+            rendered += 1
+
+    if pdf is not None:
+        pdf.close()
+
+    elapsed = time.perf_counter() - start
+    return rendered, elapsed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Render variants of Figures 5(a), 5(b) and 8')
+    parser.add_argument('--input', default=INPUT_CSV)
+    parser.add_argument('--output', default=OUTPUT_PDF, help='PDF file, or a directory with --format')
+    parser.add_argument('--format', choices=['png', 'svg', 'pdf'], help='write one image per variant into the output directory')
+    parser.add_argument('--figures', nargs='+', choices=['Figure5a', 'Figure5b', 'Figure8'], default=['Figure5a', 'Figure5b', 'Figure8'])
+    parser.add_argument('--years', nargs='*', default=[], metavar='START-END', help='year ranges, e.g. 2014-2018')
+    parser.add_argument('--regions', help='JSON file mapping region names to victim country codes')
+    parser.add_argument('--dataset', help='read a partitioned dataset written by partitioned_dataset.py instead of the CSV')
+    args = parser.parse_args()
+
+    if args.dataset:
+        from partitioned_dataset import read_dataset
+        df = read_dataset(args.dataset, VARIANT_COLUMNS)
+    else:
+        df = pd.read_csv(args.input)
+    regions = {}
+    if args.regions:
+        with open(args.regions) as f:
+            regions = json.load(f)
+
+    variants = build_variants(df, args.years, regions, args.dataset)
+    rendered, elapsed = render_variants(df, variants, args.figures, args.output, args.format)
+    print(f"[✓] {rendered} figures saved to {args.output} in {elapsed:.1f}s ({rendered / elapsed:.1f} figures/s)")
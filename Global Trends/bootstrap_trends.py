@@ -0,0 +1,214 @@
+# Code to compute bootstrap confidence intervals for the yearly trends
+# Covers the category counts and shares of Figures 5(a) and 5(b), the top-k ranks and the durations of Figure 6
+# Report rows are resampled within each year, all replicates at once as NumPy index matrices
+
+import os
+import argparse
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+INPUT_CSV = '../Information_Retrieved_Collection.csv'
+OUTPUT_PREFIX = 'Bootstrap'
+QUANTILES = [0.25, 0.5, 0.75]
+
+'''
+Function to process the original data into one indicator matrix per year
+Rows are reports and columns are the categories of the column, as in process_filter_data of the figure scripts
+'''
+def process_filter_data(input_csv, col):
+    # ------------------------------
+    # Load and Prepare Data
+    # ------------------------------
+    df = pd.read_csv(input_csv)
+
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    df['Year'] = df['Date'].dt.year
+
+    # ------------------------------
+    # Process the column
+    # ------------------------------
+    df_filtered = df.dropna(subset=[col, 'Year']).reset_index(drop=True)
+    items = df_filtered[col].str.split(', ').explode().str.strip()
+
+    codes, categories = pd.factorize(items)
+    indicator = np.zeros((len(df_filtered), len(categories)), dtype=np.float64)
+    np.add.at(indicator, (items.index.to_numpy(), codes), 1)
+
+    years = df_filtered['Year'].astype(int).to_numpy()
+    matrices = {year: indicator[years == year] for year in np.unique(years)}
+
+    return matrices, np.asarray(categories)
+
+# Helper function to draw B bootstrap replicates of n rows as a (B, n) multiplicity matrix
+def resample_weights(rng, n, replicates):
+    idx = rng.integers(0, n, size=(replicates, n))
+    idx += np.arange(replicates)[:, None] * n
+    return np.bincount(idx.ravel(), minlength=replicates * n).reshape(replicates, n).astype(np.float64)
+
+'''
+Helper function to rank the categories of every replicate, 1 for the largest count
+Tied categories share the smallest rank of the tie (min-rank), so the CSV order of the categories never breaks a tie
+'''
+def min_ranks(counts):
+    replicates, n = counts.shape
+    # Offsetting each replicate keeps its values in their own sorted run, so one binary search ranks all of them
+    offsets = np.arange(replicates)[:, None] * 2 * (np.abs(counts).max() + 1)
+    sorted_desc = (np.sort(-counts, axis=1) + offsets).ravel()
+    greater = np.searchsorted(sorted_desc, (-counts + offsets).ravel(), side='left').reshape(replicates, n)
+    return greater - np.arange(replicates)[:, None] * n + 1
+
+# Function to compute the category counts of one chunk of replicates for every year
+def _count_chunk(args):
+    matrices, seed, replicates = args
+    rng = np.random.default_rng(seed)
+    return {year: resample_weights(rng, len(x), replicates) @ x for year, x in matrices.items()}
+
+# Function to compute the duration quantiles of one chunk of replicates for every year
+def _quantile_chunk(args):
+    values_by_year, seed, replicates = args
+    rng = np.random.default_rng(seed)
+    return {
+        year: np.quantile(values[rng.integers(0, len(values), size=(replicates, len(values)))], QUANTILES, axis=1).T
+        for year, values in values_by_year.items()
+    }
+
+'''
+Function to run a chunked bootstrap across processes
+Every worker gets an independent random stream spawned from the seed
+'''
+def run_chunks(func, data, replicates, workers, seed):
+    workers = max(1, min(workers, replicates))
+    sizes = [len(chunk) for chunk in np.array_split(np.arange(replicates), workers)]
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    tasks = [(data, s, size) for s, size in zip(seeds, sizes) if size]
+
+    if workers == 1:
+        results = [func(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(func, tasks))
+
+    return {key: np.concatenate([result[key] for result in results]) for key in results[0]}
+
+'''
+Function to compute the confidence intervals of the yearly counts, shares and top-k ranks
+Returns one row per year and category
+'''
+def bootstrap_categories(matrices, categories, replicates=10000, top_k=3, alpha=0.05, workers=None, seed=0):
+    workers = workers or os.cpu_count()
+    counts_by_year = run_chunks(_count_chunk, matrices, replicates, workers, seed)
+    bounds = [alpha / 2, 1 - alpha / 2]
+
+    tables = []
+    for year, counts in counts_by_year.items():
+        # ------------------------------
+        # Shares and ranks of all replicates
+        # ------------------------------
+        totals = counts.sum(axis=1, keepdims=True)
+        shares = np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+
+        ranks = min_ranks(counts)
+
+        observed = matrices[year].sum(axis=0)
+        count_ci = np.quantile(counts, bounds, axis=0)
+        share_ci = np.quantile(shares, bounds, axis=0)
+        rank_ci = np.quantile(ranks, bounds, axis=0, method='nearest')
+
+        tables.append(pd.DataFrame({
+            'Year': year,
+            'Subcategory': categories,
+            'Attacks': observed.astype(int),
+            'Attacks_lower': count_ci[0],
+            'Attacks_upper': count_ci[1],
+            'Share': observed / max(observed.sum(), 1),
+            'Share_lower': share_ci[0],
+            'Share_upper': share_ci[1],
+            'Rank_lower': rank_ci[0].astype(int),
+            'Rank_upper': rank_ci[1].astype(int),
+            f'Top{top_k}_probability': (ranks <= top_k).mean(axis=0)
+        }))
+
+    final_df = pd.concat(tables, ignore_index=True)
+    return final_df[final_df['Attacks'] > 0].reset_index(drop=True)
+
+'''
+Function to compute the confidence intervals of the duration quantiles per report year and overall
+Returns one row per year and quantile
+'''
+def bootstrap_durations(input_csv, col='Attack_duration', replicates=10000, alpha=0.05, workers=None, seed=0):
+    df = pd.read_csv(input_csv)
+    df['Year'] = pd.to_datetime(df['Date'], errors='coerce').dt.year
+    df = df.dropna(subset=[col, 'Year'])
+
+    values_by_year = {int(year): group[col].to_numpy(dtype=np.float64) for year, group in df.groupby('Year')}
+    values_by_year['All'] = df[col].to_numpy(dtype=np.float64)
+
+    quantiles_by_year = run_chunks(_quantile_chunk, values_by_year, replicates, workers or os.cpu_count(), seed)
+
+    rows = []
+    for year, quantiles in quantiles_by_year.items():
+        lower, upper = np.quantile(quantiles, [alpha / 2, 1 - alpha / 2], axis=0)
+        observed = np.quantile(values_by_year[year], QUANTILES)
+        for q, value, lo, hi in zip(QUANTILES, observed, lower, upper):
+            rows.append([year, len(values_by_year[year]), q, value, lo, hi])
+
+    return pd.DataFrame(rows, columns=['Year', 'Reports', 'Quantile', 'Duration', 'Duration_lower', 'Duration_upper'])
+
+'''
+Function to draw the count intervals as error bars on the top of the stacked bar segments
+Only the top 3 segments of each year, the ones labeled with percentages, get an error bar
+'''
+def draw_count_error_bars(ax, pivot_df, ci_df):
+    ci = ci_df.set_index(['Year', 'Subcategory'])
+
+    for i, (year, row) in enumerate(pivot_df.iterrows()):
+        tops = row.cumsum()
+        top3_this_year = row.sort_values(ascending=False).head(3).index
+
+        for category in top3_this_year:
+            if row[category] <= 0 or (year, category) not in ci.index:
+                continue
+            lower, upper = ci.loc[(year, category), ['Attacks_lower', 'Attacks_upper']]
+            ax.errorbar(
+                i,
+                tops[category],
+                yerr=[[row[category] - lower], [upper - row[category]]],
+                fmt='none',
+                ecolor='black',
+                elinewidth=3,
+                capsize=8,
+                capthick=3
+            )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Bootstrap confidence intervals for the yearly trends')
+    parser.add_argument('--input', default=INPUT_CSV)
+    parser.add_argument('--output', default=OUTPUT_PREFIX, help='prefix of the output files')
+    parser.add_argument('--columns', nargs='+', default=['Attack_vector', 'Target_sector'])
+    parser.add_argument('--replicates', type=int, default=10000)
+    parser.add_argument('--top-k', type=int, default=3)
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--draw', action='store_true', help='also draw Figures 5(a) and 5(b) with error bars')
+    args = parser.parse_args()
+
+    for col in args.columns:
+        matrices, categories = process_filter_data(args.input, col)
+        ci_df = bootstrap_categories(matrices, categories, args.replicates, args.top_k, args.alpha, args.workers, args.seed)
+        output_csv = f'{args.output}_{col}_CI.csv'
+        ci_df.to_csv(output_csv, index=False)
+        print(f"[✓] {args.replicates} replicates of {col} saved to {output_csv}")
+
+        if args.draw and col in ('Attack_vector', 'Target_sector'):
+            if col == 'Attack_vector':
+                import overtime_changes_attack_vectors as figure
+            else:
+                import overtime_changes_target_sectors as figure
+            figure.OUTPUT_PDF = figure.OUTPUT_PDF.replace('.pdf', '_CI.pdf')
+            figure.draw_figure(figure.process_filter_data(args.input, col), ci_df)
+
+    duration_df = bootstrap_durations(args.input, replicates=args.replicates, alpha=args.alpha, workers=args.workers, seed=args.seed)
+    duration_df.to_csv(f'{args.output}_Attack_duration_CI.csv', index=False)
+    print(f"[✓] {args.replicates} replicates of Attack_duration saved to {args.output}_Attack_duration_CI.csv")
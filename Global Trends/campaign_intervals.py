@@ -0,0 +1,253 @@
+# Code to index the APT campaign spans for active-on-date and overlap queries
+# Attack_start_date and Attack_end_date become intervals of a centered interval tree,
+# so stabbing and window queries take O(log n + k) instead of a full scan per alert
+
+import argparse
+import numpy as np
+import pandas as pd
+
+from actor_profiles import build_alias_map
+from multi_value import explode_column
+
+INPUT_CSV = '../Information_Retrieved_Collection.csv'
+ACTOR_CSV = '../Threat_Actor_Collection.csv'
+CONCURRENCY_CSV = 'Campaign_Concurrency.csv'
+OVERLAPS_CSV = 'Campaign_Overlaps.csv'
+
+OVERLAP_KEYS = ['Threat_actor', 'Victim_country']
+
+# Helper function to convert dates into day numbers
+def to_days(dates):
+    return np.asarray(pd.to_datetime(dates), dtype='datetime64[D]').astype(np.int64)
+
+# Helper function to convert one date into its day number, cheaper than to_days for a single query
+def to_day(date):
+    return int(pd.Timestamp(date).to_datetime64().astype('datetime64[D]').astype(np.int64))
+
+'''
+Function to process the original data into campaign intervals
+Missing end dates are derived from Attack_duration, otherwise the campaign lasts a single day
+'''
+def process_filter_data(input_csv):
+    df = input_csv.copy() if isinstance(input_csv, pd.DataFrame) else pd.read_csv(input_csv)
+
+    start = pd.to_datetime(df['Attack_start_date'], errors='coerce')
+    end = pd.to_datetime(df['Attack_end_date'], errors='coerce')
+    end = end.fillna(start + pd.to_timedelta(df['Attack_duration'], unit='D')).fillna(start)
+
+    campaigns = pd.DataFrame({
+        'Start': start,
+        'End': end,
+        'Title': df['Title'],
+        'Source': df['Source'],
+        'Threat_actor': df['Threat_actor'],
+        'Victim_country': df['Victim_country']
+    })
+    campaigns.index.name = 'Report'
+
+    return campaigns[start.notna() & (end >= start)]
+
+'''
+Static centered interval tree over integer intervals
+Every node keeps the intervals containing its center, sorted by start and by end
+'''
+class IntervalTree:
+    def __init__(self, starts, ends):
+        self.starts = np.asarray(starts)
+        self.ends = np.asarray(ends)
+        self.nodes = []
+        self.root = self._build(np.arange(len(self.starts)))
+
+    def _build(self, ids):
+        if len(ids) == 0:
+            return -1
+
+        # The median endpoint leaves at most half of the intervals on either side
+        starts, ends = self.starts[ids], self.ends[ids]
+        center = np.median(np.concatenate([starts, ends]))
+        here = ids[(starts <= center) & (ends >= center)]
+        by_start = here[np.argsort(self.starts[here], kind='stable')]
+        by_end = here[np.argsort(self.ends[here], kind='stable')]
+
+        node = len(self.nodes)
+        self.nodes.append(None)
+        left = self._build(ids[ends < center])
+        right = self._build(ids[starts > center])
+        self.nodes[node] = (center, by_start, self.starts[by_start], by_end, self.ends[by_end], left, right)
+        return node
+
+    # Function to find the intervals overlapping [a, b]
+    def query(self, a, b):
+        found = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node < 0:
+                continue
+            center, by_start, starts, by_end, ends, left, right = self.nodes[node]
+            if b < center:
+                found.append(by_start[:np.searchsorted(starts, b, side='right')])
+                stack.append(left)
+            elif a > center:
+                found.append(by_end[np.searchsorted(ends, a, side='left'):])
+                stack.append(right)
+            else:
+                found.append(by_start)
+                stack.extend([left, right])
+
+        return np.sort(np.concatenate(found)) if found else np.array([], dtype=int)
+
+'''
+Index of the campaign intervals
+One interval tree answers the date and window queries, and one tree per actor and per victim
+country answers the overlap queries; the sorted endpoints give the active counts
+'''
+class CampaignIndex:
+    def __init__(self, campaigns, alias_map=None):
+        self.campaigns = campaigns
+        self.start_days = to_days(campaigns['Start'])
+        self.end_days = to_days(campaigns['End'])
+        self.tree = IntervalTree(self.start_days, self.end_days)
+
+        # Active campaigns at day t: (starts <= t) - (ends < t)
+        self.sorted_starts = np.sort(self.start_days)
+        self.sorted_ends = np.sort(self.end_days)
+
+        # ------------------------------
+        # Build the per-actor and per-victim trees
+        # ------------------------------
+        positions = pd.Series(np.arange(len(campaigns)), index=campaigns.index)
+        self.keys = {}
+        self.groups = {}
+        for col in OVERLAP_KEYS:
+            pairs = explode_column(campaigns, col)
+            if col == 'Threat_actor' and alias_map:
+                pairs[col] = pairs[col].str.lower().map(alias_map).fillna(pairs[col])
+            pairs['Position'] = positions.reindex(pairs['Report']).to_numpy()
+            pairs = pairs.drop_duplicates(['Position', col])
+
+            self.keys[col] = pairs.groupby('Position')[col].agg(list).to_dict()
+            self.groups[col] = {
+                key: (group.to_numpy(), IntervalTree(self.start_days[group], self.end_days[group]))
+                for key, group in pairs.groupby(col)['Position']
+            }
+
+    @classmethod
+    def load(cls, input_csv=INPUT_CSV, actor_csv=ACTOR_CSV):
+        return cls(process_filter_data(input_csv), build_alias_map(actor_csv))
+
+    # Function to find the campaigns active at some point of [start, end]
+    def active_between(self, start, end):
+        a, b = to_day(start), to_day(end)
+        return self.campaigns.iloc[self.tree.query(a, b)]
+
+    # Function to find the campaigns active on one date
+    def active_on(self, date):
+        return self.active_between(date, date)
+
+    # Function to count the campaigns active on one date with two binary searches
+    def count_active(self, date):
+        day = to_day(date)
+        return int(np.searchsorted(self.sorted_starts, day, side='right') - np.searchsorted(self.sorted_ends, day, side='left'))
+
+    '''
+    Function to compute the number of concurrent campaigns over time
+    The sweep line is evaluated at every date at once with vectorized binary searches
+    '''
+    def concurrency(self, freq='MS', start=None, end=None):
+        dates = pd.date_range(
+            start or self.campaigns['Start'].min().to_period('M').to_timestamp(),
+            end or self.campaigns['End'].max(),
+            freq=freq
+        )
+        days = to_days(dates)
+        counts = np.searchsorted(self.sorted_starts, days, side='right') - np.searchsorted(self.sorted_ends, days, side='left')
+        return pd.Series(counts, index=pd.Index(dates, name='Date'), name='Active_campaigns')
+
+    '''
+    Function to find the campaigns overlapping a campaign in time with the same actor or victim country
+    Only the trees of the keys of that campaign are searched
+    '''
+    def overlapping(self, report, by='Threat_actor'):
+        position = self.campaigns.index.get_loc(report)
+        a, b = self.start_days[position], self.end_days[position]
+
+        shared = {}
+        for key in self.keys[by].get(position, []):
+            members, tree = self.groups[by][key]
+            for hit in members[tree.query(a, b)]:
+                if hit != position:
+                    shared.setdefault(hit, []).append(key)
+
+        # The key column lists what each campaign shares with the queried one
+        hits = sorted(shared)
+        return self.campaigns.iloc[hits].assign(**{by: [', '.join(shared[hit]) for hit in hits]})
+
+    '''
+    Function to list every pair of overlapping campaigns with the same actor or victim country
+    Within each key the campaigns are sorted by start, and each one pairs with the later ones starting before it ends
+    '''
+    def overlap_pairs(self, by='Threat_actor'):
+        keys, positions = [], []
+        for key, (members, _) in self.groups[by].items():
+            keys.extend([key] * len(members))
+            positions.extend(members)
+        positions = np.asarray(positions, dtype=int)
+        key_codes = pd.factorize(pd.Series(keys))[0]
+
+        # ------------------------------
+        # Sweep every key at once
+        # ------------------------------
+        # Offsetting the days by the key code keeps each key in its own sorted run
+        span = int(self.end_days.max() - self.start_days.min()) + 1 if len(positions) else 1
+        base = self.start_days.min() if len(positions) else 0
+        sweep = key_codes * span + (self.start_days[positions] - base)
+        order = np.argsort(sweep, kind='stable')
+        sweep, positions, key_codes = sweep[order], positions[order], key_codes[order]
+
+        last = np.searchsorted(sweep, key_codes * span + (self.end_days[positions] - base), side='right')
+        n_pairs = last - np.arange(len(sweep)) - 1
+        first = np.repeat(np.arange(len(sweep)), n_pairs)
+        second = first + 1 + np.arange(n_pairs.sum()) - np.repeat(np.cumsum(n_pairs) - n_pairs, n_pairs)
+
+        a, b = positions[first], positions[second]
+        overlap_start = np.maximum(self.start_days[a], self.start_days[b])
+        overlap_end = np.minimum(self.end_days[a], self.end_days[b])
+        return pd.DataFrame({
+            'By': by,
+            'Key': np.asarray(keys, dtype=object)[order][first],
+            'Report_a': self.campaigns.index[a],
+            'Report_b': self.campaigns.index[b],
+            'Overlap_start': overlap_start.astype('datetime64[D]'),
+            'Overlap_end': overlap_end.astype('datetime64[D]'),
+            'Overlap_days': overlap_end - overlap_start + 1
+        })
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Query the campaign intervals')
+    parser.add_argument('--input', default=INPUT_CSV)
+    parser.add_argument('--date', help='list the campaigns active on this date')
+    parser.add_argument('--window', nargs=2, metavar=('START', 'END'), help='list the campaigns active in this window')
+    parser.add_argument('--report', type=int, help='list the campaigns overlapping this report')
+    parser.add_argument('--by', choices=OVERLAP_KEYS, default='Threat_actor')
+    parser.add_argument('--freq', default='MS', help='sampling frequency of the concurrency table, e.g. D, W or MS')
+    args = parser.parse_args()
+
+    index = CampaignIndex.load(args.input)
+    columns = ['Start', 'End', 'Threat_actor', 'Victim_country', 'Title']
+
+    if args.date or args.window:
+        active = index.active_on(args.date) if args.date else index.active_between(*args.window)
+        print(active[columns].to_string())
+        print(f"[✓] {len(active)} campaigns active")
+    elif args.report is not None:
+        if args.report not in index.campaigns.index:
+            parser.error(f'report {args.report} has no attack dates')
+        overlapping = index.overlapping(args.report, args.by)
+        print(overlapping[columns].to_string())
+        print(f"[✓] {len(overlapping)} overlapping campaigns by {args.by}")
+    else:
+        index.concurrency(args.freq).to_csv(CONCURRENCY_CSV)
+        pairs = pd.concat([index.overlap_pairs(col) for col in OVERLAP_KEYS], ignore_index=True)
+        pairs.to_csv(OVERLAPS_CSV, index=False)
+        print(f"[✓] Concurrency saved to {CONCURRENCY_CSV}, {len(pairs)} overlapping pairs saved to {OVERLAPS_CSV}")
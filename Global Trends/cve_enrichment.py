@@ -0,0 +1,196 @@
+# Code to enrich the CVE column with vulnerability metadata from local snapshots
+# Imports NVD JSON feeds and the CISA KEV catalog into an indexed SQLite store,
+# then annotates every report with CVSS score, publish date and disclosure-to-report lag
+
+import os
+import re
+import gzip
+import json
+import sqlite3
+import argparse
+import pandas as pd
+
+INPUT_CSV = '../Information_Retrieved_Collection.csv'
+STORE_DB = 'cve_store.sqlite'
+OUTPUT_CSV = 'CVE_Enrichment.csv'
+
+CVE_PATTERN = re.compile(r'CVE-\d{4}-\d{4,}')
+# Some extracted IDs use unicode dashes, e.g. "CVE-2021‑21551"
+DASHES = str.maketrans({'‐': '-', '‑': '-', '‒': '-', '–': '-', '—': '-', '−': '-'})
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS cve (
+    cve_id TEXT PRIMARY KEY,
+    published TEXT,
+    cvss REAL,
+    cvss_version TEXT,
+    severity TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS kev (
+    cve_id TEXT PRIMARY KEY,
+    date_added TEXT,
+    ransomware TEXT
+) WITHOUT ROWID;
+'''
+
+# Helper function to read a JSON file, gzip-compressed or not
+def load_json(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+# Helper function to pick the most recent CVSS version available in an NVD record
+def pick_cvss(metrics):
+    for key, version in (('cvssMetricV40', '4.0'), ('cvssMetricV31', '3.1'), ('cvssMetricV30', '3.0'), ('cvssMetricV2', '2.0')):
+        entries = metrics.get(key)
+        if entries:
+            primary = next((e for e in entries if e.get('type') == 'Primary'), entries[0])
+            data = primary['cvssData']
+            return data.get('baseScore'), version, data.get('baseSeverity', primary.get('baseSeverity'))
+    return None, None, None
+
+'''
+Function to parse an NVD feed into (cve_id, published, cvss, cvss_version, severity) rows
+Supports both the NVD 2.0 API/feed format and the legacy 1.1 JSON feeds
+'''
+def parse_nvd(feed):
+    rows = []
+    if 'vulnerabilities' in feed:
+        for item in feed['vulnerabilities']:
+            cve = item['cve']
+            score, version, severity = pick_cvss(cve.get('metrics', {}))
+            rows.append((cve['id'], cve.get('published', '')[:10] or None, score, version, severity))
+    else:
+        for item in feed.get('CVE_Items', []):
+            impact = item.get('impact', {})
+            if 'baseMetricV3' in impact:
+                cvss = impact['baseMetricV3']['cvssV3']
+                score, version, severity = cvss.get('baseScore'), cvss.get('version', '3.x'), cvss.get('baseSeverity')
+            elif 'baseMetricV2' in impact:
+                score, version, severity = impact['baseMetricV2']['cvssV2'].get('baseScore'), '2.0', impact['baseMetricV2'].get('severity')
+            else:
+                score, version, severity = None, None, None
+            rows.append((item['cve']['CVE_data_meta']['ID'], item.get('publishedDate', '')[:10] or None, score, version, severity))
+    return rows
+
+'''
+Function to load NVD feeds and a KEV snapshot into the store
+Rows are upserted in bulk, so feeds can be re-imported as they are updated
+'''
+def import_snapshots(db_path, nvd_paths, kev_path=None):
+    con = sqlite3.connect(db_path)
+    con.executescript(SCHEMA)
+
+    n_cve = n_kev = 0
+    with con:
+        for path in nvd_paths:
+            rows = parse_nvd(load_json(path))
+            con.executemany('INSERT OR REPLACE INTO cve VALUES (?, ?, ?, ?, ?)', rows)
+            n_cve += len(rows)
+
+        if kev_path:
+            rows = [
+                (item['cveID'], item.get('dateAdded'), item.get('knownRansomwareCampaignUse'))
+                for item in load_json(kev_path).get('vulnerabilities', [])
+            ]
+            con.executemany('INSERT OR REPLACE INTO kev VALUES (?, ?, ?)', rows)
+            n_kev += len(rows)
+
+    con.close()
+    return n_cve, n_kev
+
+'''
+Function to process the original data into one row per (report, CVE)
+IDs are normalized so that they match the keys of the store
+'''
+def process_filter_data(input_csv):
+    df = input_csv.copy() if isinstance(input_csv, pd.DataFrame) else pd.read_csv(input_csv)
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+
+    cves = df['CVE'].dropna().str.translate(DASHES).str.upper().str.findall(CVE_PATTERN).explode().dropna()
+    report_cves = cves.rename('CVE_ID').reset_index().drop_duplicates()
+    report_cves = report_cves.rename(columns={'index': 'Report'})
+
+    return df, report_cves
+
+'''
+Function to fetch the metadata of many CVEs with one query
+The IDs go into a temporary table that is joined against the primary keys of the store
+'''
+def lookup_cves(db_path, cve_ids):
+    con = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    con.execute('CREATE TEMP TABLE wanted (cve_id TEXT PRIMARY KEY)')
+    con.executemany('INSERT OR IGNORE INTO wanted VALUES (?)', ((cve_id,) for cve_id in cve_ids))
+
+    metadata = pd.read_sql_query('''
+        SELECT w.cve_id AS CVE_ID, c.published AS Published, c.cvss AS CVSS,
+               c.cvss_version AS CVSS_version, c.severity AS Severity,
+               k.date_added AS KEV_added, k.ransomware AS KEV_ransomware
+        FROM wanted w
+        LEFT JOIN cve c ON c.cve_id = w.cve_id
+        LEFT JOIN kev k ON k.cve_id = w.cve_id
+    ''', con)
+    con.close()
+
+    metadata['Published'] = pd.to_datetime(metadata['Published'], errors='coerce')
+    metadata['KEV_added'] = pd.to_datetime(metadata['KEV_added'], errors='coerce')
+    return metadata
+
+'''
+Function to annotate every report with the metadata of its CVEs
+Returns the per-(report, CVE) table and the per-report summary
+'''
+def annotate_reports(input_csv, db_path):
+    df, report_cves = process_filter_data(input_csv)
+
+    # ------------------------------
+    # Join the metadata in bulk
+    # ------------------------------
+    metadata = lookup_cves(db_path, report_cves['CVE_ID'].unique())
+    report_cves = report_cves.merge(metadata, on='CVE_ID', how='left')
+    report_cves['Date'] = df['Date'].reindex(report_cves['Report']).to_numpy()
+    report_cves['Disclosure_to_report_days'] = (report_cves['Date'] - report_cves['Published']).dt.days
+    report_cves['Zero-day'] = df['Zero-day'].reindex(report_cves['Report']).to_numpy()
+
+    # ------------------------------
+    # Summarize per report
+    # ------------------------------
+    summary = report_cves.groupby('Report').agg(
+        CVEs=('CVE_ID', 'count'),
+        CVEs_known=('Published', 'count'),
+        Max_CVSS=('CVSS', 'max'),
+        Earliest_published=('Published', 'min'),
+        Min_disclosure_to_report_days=('Disclosure_to_report_days', 'min'),
+        In_KEV=('KEV_added', 'count')
+    )
+    annotated = df.join(summary)
+
+    return report_cves, annotated
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Offline CVE enrichment from local NVD and KEV snapshots')
+    parser.add_argument('--db', default=STORE_DB)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help='load NVD feeds and a KEV snapshot into the store')
+    import_parser.add_argument('--nvd', nargs='+', default=[], help='NVD JSON feeds (.json or .json.gz)')
+    import_parser.add_argument('--kev', help='CISA known_exploited_vulnerabilities.json')
+
+    annotate_parser = subparsers.add_parser('annotate', help='annotate the reports with CVE metadata')
+    annotate_parser.add_argument('--input', default=INPUT_CSV)
+    annotate_parser.add_argument('--output', default=OUTPUT_CSV)
+
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        n_cve, n_kev = import_snapshots(args.db, args.nvd, args.kev)
+        print(f"[✓] {n_cve} NVD records and {n_kev} KEV entries imported into {args.db}")
+    else:
+        if not os.path.exists(args.db):
+            parser.error(f'{args.db} does not exist, run the import command first')
+        report_cves, annotated = annotate_reports(args.input, args.db)
+        root, ext = os.path.splitext(args.output)
+        report_cves.to_csv(f'{root}_PerCVE{ext or ".csv"}', index=False)
+        annotated.to_csv(args.output, index=False)
+        known = report_cves['Published'].notna().sum()
+        print(f"[✓] {len(report_cves)} report CVEs ({known} found in the store) saved to {args.output}")
@@ -0,0 +1,123 @@
+# Code to export the aggregate table behind each figure, without drawing it
+# Only pandas and numpy are loaded; the plotting libraries stay unimported
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+import pandas as pd
+
+import overtime_changes_victimCountries as figure4a
+import overtime_changes_threat_actors as figure4b
+import overtime_changes_target_sectors as figure5a
+import overtime_changes_attack_vectors as figure5b
+import attack_duration_CDF as figure6
+import attacker_victim_relationship as figure8
+
+INPUT_CSV = '../Information_Retrieved_Collection.csv'
+OUTPUT_DIR = 'aggregates'
+
+FIGURES = {
+    'Figure4a_VictimChanges': lambda source: figure4a.process_filter_data(source, 'Victim_country'),
+    'Figure4b_ActorChanges': lambda source: figure4b.process_filter_data(source, 'Threat_actor'),
+    'Figure5a_TargetSectorChanges': lambda source: figure5a.process_filter_data(source, 'Target_sector'),
+    'Figure5b_AttackVectorChanges': lambda source: figure5b.process_filter_data(source, 'Attack_vector'),
+    'Figure6_AttackDurationCDF': lambda source: figure6.process_filter_data(source, 'Attack_duration'),
+    'Figure8_Heatmap': lambda source: figure8.process_filter_data(source)
+}
+
+# Columns each figure reads, the only ones loaded from a partitioned dataset
+FIGURE_COLUMNS = {
+    'Figure4a_VictimChanges': ['Date', 'Victim_country', 'Zero-day'],
+    'Figure4b_ActorChanges': ['Date', 'Threat_actor', 'Zero-day'],
+    'Figure5a_TargetSectorChanges': ['Date', 'Target_sector'],
+    'Figure5b_AttackVectorChanges': ['Date', 'Attack_vector'],
+    'Figure6_AttackDurationCDF': ['Attack_duration'],
+    'Figure8_Heatmap': ['Threat_country', 'Victim_country']
+}
+
+PLOTTING_MODULES = ['matplotlib.pyplot', 'seaborn', 'altair']
+
+'''
+Function to load the reports the figures need
+From a partitioned dataset (see partitioned_dataset.py), only the partitions of the year range
+and the columns of the selected figures are read
+'''
+def load_reports(input_csv, figures, dataset=None, years=None):
+    if dataset:
+        from partitioned_dataset import read_dataset
+
+        columns = list(dict.fromkeys(col for name in figures for col in FIGURE_COLUMNS[name]))
+        filters = [('Year', '>=', years[0]), ('Year', '<=', years[1])] if years else None
+        return read_dataset(dataset, columns, filters)
+
+    df = pd.read_csv(input_csv)
+    if years:
+        year = pd.to_datetime(df['Date'], errors='coerce').dt.year
+        df = df[(year >= years[0]) & (year <= years[1])]
+    return df
+
+'''
+Function to compute the aggregate tables of the selected figures
+The reports are read once and shared by every figure
+'''
+def compute_aggregates(input_csv, figures, dataset=None, years=None):
+    df = load_reports(input_csv, figures, dataset, years)
+    return {name: FIGURES[name](df).reset_index(drop=True) for name in figures}
+
+# Function to write one aggregate table as CSV, JSON or Parquet
+def write_table(df, path, file_format):
+    if file_format == 'csv':
+        df.to_csv(path, index=False)
+    elif file_format == 'json':
+        df.to_json(path, orient='records', indent=1)
+    else:
+        # Parquet needs pyarrow or fastparquet
+        df.to_parquet(path, index=False)
+
+'''
+Function to measure the cold start of both paths in fresh interpreters
+The aggregate path imports the figure modules, the drawing path also loads the plotting libraries
+'''
+def measure_cold_start():
+    figure_imports = 'import ' + ', '.join(module.__name__ for module in (figure4a, figure4b, figure5a, figure5b, figure6, figure8))
+    commands = {
+        'aggregates': figure_imports,
+        'drawing': figure_imports + '; import ' + ', '.join(PLOTTING_MODULES)
+    }
+
+    timings = {}
+    for path, command in commands.items():
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', command], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        timings[path] = time.perf_counter() - start
+
+    return timings
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Export the aggregate table of each figure without drawing it')
+    parser.add_argument('--input', default=INPUT_CSV)
+    parser.add_argument('--output', default=OUTPUT_DIR)
+    parser.add_argument('--format', choices=['csv', 'json', 'parquet'], default='csv')
+    parser.add_argument('--figures', nargs='+', choices=list(FIGURES), default=list(FIGURES))
+    parser.add_argument('--dataset', help='read a partitioned dataset written by partitioned_dataset.py instead of the CSV')
+    parser.add_argument('--years', metavar='START-END', help='only aggregate the reports of a year range, e.g. 2020-2023')
+    parser.add_argument('--cold-start', action='store_true', help='report the cold-start time of the aggregate and drawing paths')
+    args = parser.parse_args()
+
+    years = [int(year) for year in args.years.split('-')] if args.years else None
+
+    os.makedirs(args.output, exist_ok=True)
+    for name, table in compute_aggregates(args.input, args.figures, args.dataset, years).items():
+        path = os.path.join(args.output, f'{name}.{args.format}')
+        write_table(table, path, args.format)
+        print(f"[✓] {name} aggregates saved to {path}")
+
+    loaded = [module for module in PLOTTING_MODULES if module in sys.modules]
+    if loaded:
+        print(f"[!] Plotting libraries were imported: {', '.join(loaded)}", file=sys.stderr)
+
+    if args.cold_start:
+        for path, seconds in measure_cold_start().items():
+            print(f"[✓] Cold start of the {path} path: {seconds:.2f}s")
@@ -0,0 +1,296 @@
+# Code to export per-country data tiles for the interactive APT map
+# Each tile holds everything the map shows for one attacking or victim country
+# See "Visual Representations: Interactive APT Map" in the README
+
+import os
+import io
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+import threading
+import pandas as pd
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+INPUT_CSV = '../Information_Retrieved_Collection.csv'
+OUTPUT_DIR = 'map_tiles'
+MANIFEST = 'manifest.json'
+
+ROLE_COLUMNS = {
+    'attacker': 'Threat_country',
+    'victim': 'Victim_country'
+}
+LIST_COLUMNS = ['Threat_actor', 'CVE', 'Attack_vector', 'Malware', 'Target_sector']
+
+# Helper function to split a multi-value cell into a sorted list of unique items
+def split_items(value, sep=','):
+    if not isinstance(value, str):
+        return []
+    return sorted(set(item.strip() for item in value.split(sep) if item.strip() and item.strip() != 'NaN'))
+
+# Helper function to count the items of an exploded list column, most frequent first
+def count_items(series):
+    counts = series.explode().dropna().value_counts()
+    counts = counts.rename_axis('Item').reset_index(name='Count')
+    counts = counts.sort_values(['Count', 'Item'], ascending=[False, True], kind='mergesort')
+    return dict(zip(counts['Item'], counts['Count'].astype(int)))
+
+'''
+Function to process the original data
+Splits the country columns and the multi-value columns once, so every tile reuses them
+'''
+def process_filter_data(input_csv):
+    # ------------------------------
+    # Load and Prepare Data
+    # ------------------------------
+    df = pd.read_csv(input_csv, dtype=str)
+
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    df['Year'] = df['Date'].dt.year
+    df['Attack_duration'] = pd.to_numeric(df['Attack_duration'], errors='coerce')
+
+    # One content hash per report row, used to detect which countries changed
+    df['RowHash'] = pd.util.hash_pandas_object(df.drop(columns=['Year']), index=False).astype('uint64')
+
+    # ------------------------------
+    # Split the multi-value columns
+    # ------------------------------
+    df['Threat_country'] = df['Threat_country'].apply(lambda x: split_items(x.replace('; ', ';'), ';') if isinstance(x, str) else [])
+    df['Victim_country'] = df['Victim_country'].apply(split_items)
+    for col in LIST_COLUMNS:
+        df[col] = df[col].apply(split_items)
+
+    return df
+
+'''
+Function to build the tile document of one country in one role
+Counts actors, CVEs, vectors, malware and sectors, and summarizes the durations
+'''
+def build_tile(country, role, rows):
+    other_col = ROLE_COLUMNS['victim' if role == 'attacker' else 'attacker']
+    durations = rows['Attack_duration'].dropna()
+
+    reports = rows.sort_values('Date', kind='mergesort')[['Date', 'Filename', 'Download_url', 'Attack_duration']]
+
+    return {
+        'country': country,
+        'role': role,
+        'reports': int(len(rows)),
+        'years': {str(int(year)): int(count) for year, count in rows['Year'].dropna().value_counts().sort_index().items()},
+        'countries': count_items(rows[other_col]),
+        'threat_actors': count_items(rows['Threat_actor']),
+        'cves': count_items(rows['CVE']),
+        'attack_vectors': count_items(rows['Attack_vector']),
+        'malware': count_items(rows['Malware']),
+        'target_sectors': count_items(rows['Target_sector']),
+        'zero_day': int((rows['Zero-day'].astype(str).str.lower() == 'true').sum()),
+        'duration': {
+            'count': int(len(durations)),
+            'median': float(durations.median()) if len(durations) else None,
+            'mean': round(float(durations.mean()), 1) if len(durations) else None,
+            'max': float(durations.max()) if len(durations) else None
+        },
+        'timeline': [
+            {
+                'date': date.strftime('%Y-%m-%d') if pd.notna(date) else None,
+                'title': filename,
+                'url': url,
+                'duration': float(duration) if pd.notna(duration) else None
+            }
+            for date, filename, url, duration in reports.itertuples(index=False)
+        ]
+    }
+
+# Helper function to build the strong ETag of one encoded body
+def make_etag(body):
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+'''
+Function to write one tile as raw, gzip and (when available) brotli files
+Returns the ETag of each written encoding, since every encoding has its own bytes
+'''
+def write_tile(path, payload):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(payload)
+    etags = {'identity': make_etag(payload)}
+
+    # mtime=0 keeps the gzip bytes stable across rebuilds
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=9, mtime=0) as f:
+        f.write(payload)
+    with open(path + '.gz', 'wb') as f:
+        f.write(buffer.getvalue())
+    etags['gzip'] = make_etag(buffer.getvalue())
+
+    if brotli is not None:
+        body = brotli.compress(payload)
+        with open(path + '.br', 'wb') as f:
+            f.write(body)
+        etags['br'] = make_etag(body)
+
+    return etags
+
+'''
+Function to export the tiles of every country in both roles
+Only countries whose report rows changed since the last export are rebuilt
+'''
+def export_tiles(df, output_dir):
+    manifest_path = os.path.join(output_dir, MANIFEST)
+    previous = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            previous = json.load(f).get('tiles', {})
+
+    tiles = {}
+    written = 0
+    for role, col in ROLE_COLUMNS.items():
+        exploded = df[[col, 'RowHash']].explode(col).dropna(subset=[col])
+
+        # ------------------------------
+        # Fingerprint the rows of each country
+        # ------------------------------
+        fingerprints = (
+            exploded.sort_values('RowHash', kind='mergesort')
+            .groupby(col)['RowHash']
+            .apply(lambda hashes: hashlib.sha256(hashes.to_numpy().tobytes()).hexdigest())
+        )
+        row_index = exploded.groupby(col).groups
+
+        for country, fingerprint in fingerprints.items():
+            key = f'{role}/{country}'
+            path = os.path.join(output_dir, role, f'{country}.json')
+            entry = previous.get(key)
+
+            if entry and entry['fingerprint'] == fingerprint and 'etags' in entry and os.path.exists(path + '.gz'):
+                tiles[key] = entry
+                continue
+
+            # ------------------------------
+            # Rebuild the changed tile
+            # ------------------------------
+            tile = build_tile(country, role, df.loc[row_index[country]])
+            payload = json.dumps(tile, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+            etags = write_tile(path, payload)
+            written += 1
+
+            tiles[key] = {
+                'fingerprint': fingerprint,
+                'etags': etags,
+                'bytes': len(payload),
+                'reports': tile['reports']
+            }
+
+    # ------------------------------
+    # Remove tiles of countries that disappeared
+    # ------------------------------
+    for key in previous.keys() - tiles.keys():
+        for ext in ('', '.gz', '.br'):
+            path = os.path.join(output_dir, key + '.json' + ext)
+            if os.path.exists(path):
+                os.remove(path)
+
+    # A running server never reads a half-written manifest
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump({'tiles': tiles}, f, indent=1, sort_keys=True)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+    return written, len(tiles)
+
+'''
+Static file handler for local testing of the tiles
+Serves the best pre-compressed variant the client accepts, with the manifest ETag of that variant
+The manifest is reloaded whenever the tiles are re-exported, so the ETags follow the files being served
+'''
+class TileHandler(SimpleHTTPRequestHandler):
+    manifest = {}
+    manifest_version = None
+    manifest_lock = threading.Lock()
+
+    @classmethod
+    def load_manifest(cls, output_dir):
+        stat = os.stat(os.path.join(output_dir, MANIFEST))
+        version = (stat.st_ino, stat.st_mtime_ns)
+        with cls.manifest_lock:
+            if version != cls.manifest_version:
+                with open(os.path.join(output_dir, MANIFEST)) as f:
+                    cls.manifest = json.load(f)['tiles']
+                cls.manifest_version = version
+            return cls.manifest
+
+    def end_headers(self):
+        self.send_header('Access-Control-Allow-Origin', '*')
+        super().end_headers()
+
+    def do_GET(self):
+        key = self.path.split('?')[0].strip('/')
+        if key.endswith('.json'):
+            key = key[:-len('.json')]
+        entry = self.load_manifest(self.directory).get(key)
+        if entry is None:
+            return super().do_GET()
+
+        accepted = self.headers.get('Accept-Encoding', '')
+        path = os.path.join(self.directory, key + '.json')
+        encoding = None
+        for candidate, ext in (('br', '.br'), ('gzip', '.gz')):
+            if candidate in accepted and candidate in entry['etags'] and os.path.exists(path + ext):
+                path, encoding = path + ext, candidate
+                break
+        etag = entry['etags'][encoding or 'identity']
+
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+
+        with open(path, 'rb') as f:
+            body = f.read()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'public, max-age=3600')
+        self.send_header('Vary', 'Accept-Encoding')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        self.wfile.write(body)
+
+# Function to serve the exported tiles on localhost
+def serve_tiles(output_dir, port):
+    TileHandler.load_manifest(output_dir)
+
+    handler = lambda *args, **kwargs: TileHandler(*args, directory=output_dir, **kwargs)
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    print(f"[✓] Serving {output_dir} at http://127.0.0.1:{port}/attacker/CN.json")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Export per-country JSON tiles for the APT map')
+    parser.add_argument('--input', default=INPUT_CSV)
+    parser.add_argument('--output', default=OUTPUT_DIR)
+    parser.add_argument('--serve', action='store_true', help='serve the tiles on localhost after exporting')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    final_df = process_filter_data(args.input)
+    written, total = export_tiles(final_df, args.output)
+    print(f"[✓] {written} of {total} map tiles rebuilt in {args.output}")
+    if brotli is None:
+        print("[!] brotli is not installed, only gzip tiles were written", file=sys.stderr)
+
+    if args.serve:
+        serve_tiles(args.output, args.port)
@@ -0,0 +1,30 @@
+# Helpers shared by the scripts that only process the reports appended since their previous run
+# A run records how many rows it processed and a digest of them, and the next run reuses its results
+# only while those rows are unchanged
+
+import hashlib
+import pandas as pd
+
+# Helper function to hash the report rows, one value per row
+def hash_rows(df):
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+# Helper function to digest a block of rows into one hex string
+def digest_rows(df):
+    return hashlib.sha256(hash_rows(df).tobytes()).hexdigest()
+
+'''
+Function to find how many rows of a previous run can be reused
+state is the {'rows', 'digest'} the previous run recorded, or None
+Returns the number of rows already processed, None when they changed and everything must be rebuilt,
+and the {'rows', 'digest'} to record for the current rows
+'''
+def appended_rows(df, state):
+    row_hashes = hash_rows(df)
+    current = {'rows': len(df), 'digest': hashlib.sha256(row_hashes.tobytes()).hexdigest()}
+
+    if state is None or state['rows'] > len(df):
+        return None, current
+    if state['digest'] != hashlib.sha256(row_hashes[:state['rows']].tobytes()).hexdigest():
+        return None, current
+    return state['rows'], current
@@ -0,0 +1,166 @@
+# Code to resolve the Malware column into canonical malware families
+# Names mix families, vendor detection names and descriptions,
+# e.g. "Poison Ivy Trojan Backdoor.Darkmoon, Trojan droppers, Backdoor.Trojan, Shamoon/Disttrack"
+# Names are normalized into keys, blocked by character 3-grams and clustered by 3-gram similarity
+
+import os
+import re
+import argparse
+import pandas as pd
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+INPUT_CSV = '../Information_Retrieved_Collection.csv'
+OUTPUT_CSV = 'Malware_Families.csv'
+
+# Vendor detection prefixes, e.g. "Backdoor.", "Win32/", "TROJ_", "Trojan.Win32."
+DETECTION_PREFIX = re.compile(
+    r'^(?:(?:trojan|backdoor|troj|bkdr|bkdr64|tspy|worm|hacktool|infostealer|downloader|dropper|ransom|'
+    r'exploit|virus|spyware|adware|riskware|pua|msil|win32|win64|w32|w64|linux|osx|macos|android|js|vbs|html)'
+    r'(?:[._/:-]|$))+'
+)
+# Variant suffixes of detection names, e.g. ".A", ".ZAEL-A", ".ciok"
+DETECTION_SUFFIX = re.compile(r'\.[a-z0-9-]{1,6}$')
+GENERIC_WORDS = {
+    'malware', 'trojan', 'trojans', 'backdoor', 'backdoors', 'rat', 'variant', 'variants', 'implant',
+    'family', 'new', 'custom', 'modified', 'sample', 'samples', 'the', 'a', 'an', 'aka'
+}
+
+'''
+Function to normalize a malware name into a matching key
+Drops parenthesized notes, detection prefixes and suffixes, generic words and punctuation
+'''
+def normalize_name(name):
+    key = re.sub(r'\(.*?\)|\[.*?\]', ' ', name.lower()).strip(' .')
+
+    stripped = DETECTION_PREFIX.sub('', key)
+    if stripped != key:
+        key = DETECTION_SUFFIX.sub('', stripped)
+
+    words = [word for word in re.split(r'[^a-z0-9]+', key) if word and word not in GENERIC_WORDS]
+    return ''.join(words)
+
+# Helper function to get the character 3-grams of a key
+def trigrams(key):
+    padded = f'#{key}#'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# Function to compare the candidate pairs of a chunk of blocks
+def _match_blocks(args):
+    blocks, grams, threshold = args
+    matches = set()
+    for members in blocks:
+        for a_pos, a in enumerate(members):
+            for b in members[a_pos + 1:]:
+                if (a, b) in matches:
+                    continue
+                ga, gb = grams[a], grams[b]
+                if len(ga & gb) / len(ga | gb) >= threshold:
+                    matches.add((a, b))
+    return matches
+
+'''
+Function to cluster the normalized keys
+Candidates share a 3-gram block (oversized blocks of common 3-grams are skipped), and pairs above
+the Jaccard threshold are merged with union-find
+'''
+def cluster_keys(keys, threshold=0.7, max_block=100, min_length=5, workers=None):
+    grams = [trigrams(key) for key in keys]
+
+    # ------------------------------
+    # Build the 3-gram blocks
+    # ------------------------------
+    postings = defaultdict(list)
+    for idx, (key, key_grams) in enumerate(zip(keys, grams)):
+        # Short keys only merge on exact matches, e.g. "ds" or "rc4"
+        if len(key) >= min_length:
+            for gram in key_grams:
+                postings[gram].append(idx)
+    blocks = [members for members in postings.values() if 1 < len(members) <= max_block]
+
+    # ------------------------------
+    # Compare the candidates in parallel
+    # ------------------------------
+    workers = workers or os.cpu_count()
+    chunks = [blocks[i::workers] for i in range(workers)]
+    if workers == 1:
+        results = [_match_blocks((blocks, grams, threshold))]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_match_blocks, [(chunk, grams, threshold) for chunk in chunks]))
+
+    # ------------------------------
+    # Merge the matches
+    # ------------------------------
+    parent = list(range(len(keys)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for matches in results:
+        for a, b in matches:
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    return [find(i) for i in range(len(keys))]
+
+'''
+Function to process the original data into the canonical family table
+One row per distinct malware string, with the family it resolves to
+'''
+def process_filter_data(input_csv, threshold=0.7, workers=None):
+    df = input_csv.copy() if isinstance(input_csv, pd.DataFrame) else pd.read_csv(input_csv)
+
+    names = df['Malware'].dropna().str.split(',').explode().str.strip()
+    counts = names[names != ''].value_counts().rename_axis('Malware').reset_index(name='Reports')
+    counts['Key'] = counts['Malware'].apply(normalize_name)
+
+    # Strings made only of generic words, e.g. "Backdoor.Trojan", do not name a family
+    counts = counts[counts['Key'] != ''].reset_index(drop=True)
+
+    keys = counts['Key'].drop_duplicates().tolist()
+    clusters = dict(zip(keys, cluster_keys(keys, threshold, workers=workers)))
+    counts['Cluster'] = counts['Key'].map(clusters)
+
+    # ------------------------------
+    # Name each family after its most reported string
+    # ------------------------------
+    counts['Length'] = counts['Malware'].str.len()
+    canonical = (
+        counts.sort_values(['Cluster', 'Reports', 'Length', 'Malware'], ascending=[True, False, True, True], kind='mergesort')
+        .drop_duplicates('Cluster').set_index('Cluster')['Malware']
+    )
+    counts['Family'] = counts['Cluster'].map(canonical)
+
+    return counts[['Malware', 'Family', 'Key', 'Reports']].sort_values(['Family', 'Reports'], ascending=[True, False], kind='mergesort')
+
+'''
+Function to replace the Malware column with the canonical families
+Strings missing from the table, or resolved to nothing, are kept as they are
+'''
+def apply_families(df, families):
+    if isinstance(families, str):
+        families = pd.read_csv(families)
+    mapping = dict(zip(families['Malware'], families['Family']))
+
+    df = df.copy()
+    df['Malware'] = df['Malware'].apply(
+        lambda x: ', '.join(dict.fromkeys(mapping.get(v.strip(), v.strip()) for v in x.split(','))) if isinstance(x, str) else x
+    )
+    return df
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Resolve malware names into canonical families')
+    parser.add_argument('--input', default=INPUT_CSV)
+    parser.add_argument('--output', default=OUTPUT_CSV)
+    parser.add_argument('--threshold', type=float, default=0.7, help='3-gram Jaccard similarity to merge two names')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    families = process_filter_data(args.input, args.threshold, args.workers)
+    families.to_csv(args.output, index=False)
+    print(f"[✓] {len(families)} malware names resolved into {families['Family'].nunique()} families, saved to {args.output}")
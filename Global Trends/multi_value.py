@@ -0,0 +1,8 @@
+# Helpers shared by the scripts that split the multi-value columns of the collection
+# Cells list several items separated by commas, or by semicolons for Threat_country
+
+# Helper function to split a multi-value column into (row, item) pairs
+def explode_column(df, col, sep=','):
+    s = df[col].dropna().str.replace('; ', ';').str.split(sep).explode().str.strip()
+    s = s[(s != '') & (s != 'NaN')]
+    return s.rename(col).reset_index().drop_duplicates()
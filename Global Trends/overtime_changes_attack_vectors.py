@@ -3,12 +3,14 @@
 # Section 4.1: Initial Attack Vectors
 
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 
 INPUT_CSV = '../Information_Retrieved_Collection.csv'
 OUTPUT_PDF = 'Figure5b_AttackVectorChanges.pdf'
 
+ATTACK_VECTORS_MAPPING = {
+    'Exploit Vulnerability': 'Vulnerability Exploitation'
+}
+
 '''
 Function to process the original data and filter to the attack vectors
 Counts the number of attacks per year for each attack vector
@@ -17,7 +19,7 @@ def process_filter_data(input_csv, col):
     # ------------------------------
     # Load and Prepare Data
     # ------------------------------
-    df = pd.read_csv(input_csv)
+    df = input_csv.copy() if isinstance(input_csv, pd.DataFrame) else pd.read_csv(input_csv)
     
     df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
     df['Year'] = df['Date'].dt.year
@@ -41,8 +43,8 @@ def process_filter_data(input_csv, col):
 
     return final_df
 
-# Function to draw the figure
-def draw_figure(input_df):
+# Function to pivot the counts into one column per attack vector, with the top 3 first
+def build_pivot(input_df):
     df = input_df
 
     # ------------------------------
@@ -51,10 +53,7 @@ def draw_figure(input_df):
     vector_df = df[df['Column'] == 'Attack_vector'].reset_index(drop=True)
     vector_df['Subcategory'] = vector_df['Subcategory'].str.strip().str.title()
 
-    attack_vectors_mapping = {
-        'Exploit Vulnerability': 'Vulnerability Exploitation'
-    }
-    vector_df['Subcategory'] = vector_df['Subcategory'].replace(attack_vectors_mapping)
+    vector_df['Subcategory'] = vector_df['Subcategory'].replace(ATTACK_VECTORS_MAPPING)
 
     pivot_df = vector_df.pivot(index='Year', columns='Subcategory', values='Attacks').fillna(0)
 
@@ -68,6 +67,12 @@ def draw_figure(input_df):
     ordered_columns = top_three_vectors.tolist() + remaining_vectors.tolist()
     pivot_df = pivot_df[ordered_columns]
 
+    return pivot_df
+
+# Function to get the color of each attack vector column
+def build_colors(columns):
+    import seaborn as sns
+
     # ------------------------------
     # Set the color palette for each attack vector
     # ------------------------------
@@ -88,7 +93,14 @@ def draw_figure(input_df):
         'Website Equipping': full_tab20[15] 
     }
 
-    colors = [color_map[vector] for vector in pivot_df.columns]
+    return [color_map[vector] for vector in columns]
+
+# Function to draw the figure, optionally with bootstrap error bars from bootstrap_trends.py
+def draw_figure(input_df, ci_df=None):
+    import matplotlib.pyplot as plt
+
+    pivot_df = build_pivot(input_df)
+    colors = build_colors(pivot_df.columns)
 
     # ------------------------------
     # Create the stacked bar plot
@@ -148,6 +160,14 @@ def draw_figure(input_df):
                 )
             cumulative_bottom += height
 
+    # ------------------------------
+    # Add the bootstrap error bars
+    # ------------------------------
+    if ci_df is not None:
+        from bootstrap_trends import draw_count_error_bars
+        ci_df = ci_df.assign(Subcategory=ci_df['Subcategory'].str.strip().str.title().replace(ATTACK_VECTORS_MAPPING))
+        draw_count_error_bars(ax, pivot_df, ci_df)
+
     for spine in ax.spines.values():
         spine.set_linewidth(3)  
         spine.set_color('black')
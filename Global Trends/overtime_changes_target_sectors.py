@@ -3,12 +3,25 @@
 # Section 4.1: Target Sectors
 
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 
 INPUT_CSV = '../Information_Retrieved_Collection.csv'
 OUTPUT_PDF = 'Figure5a_TargetSectorChanges.pdf' 
 
+TARGET_SECTOR_MAPPING = {
+    'Government And Defense Agencies': 'Government/Defense',
+    'Corporations And Businesses': 'Corporation/Business',
+    'Financial Institutions': 'Financial',
+    'Healthcare': 'Healthcare',
+    'Energy And Utilities': 'Energy/Utility',
+    'Cloud/Iot Services': 'Cloud/IoT',
+    'Manufacturing': 'Manufacturing',
+    'Education And Research Institutions': 'Education/Research',
+    'Media And Entertainment Companies': 'Media/Entertainment',
+    'Critical Infrastructure': 'Critical',
+    'Non-Governmental Organizations (Ngos) And Nonprofits': 'NGO/Nonprofit',
+    'Individuals': 'Individual'
+}
+
 '''
 Function to process the original data and filter to the target sectors
 Count the number of attacks per year for each target sector
@@ -17,7 +30,7 @@ def process_filter_data(input_csv, col):
     # ------------------------------
     # Load and Prepare Data
     # ------------------------------
-    df = pd.read_csv(input_csv)
+    df = input_csv.copy() if isinstance(input_csv, pd.DataFrame) else pd.read_csv(input_csv)
 
     df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
     df['Year'] = df['Date'].dt.year
@@ -41,8 +54,8 @@ def process_filter_data(input_csv, col):
 
     return final_df
 
-# Function to draw the figure
-def draw_figure(input_df):
+# Function to pivot the counts into one column per target sector, with the top 3 first
+def build_pivot(input_df):
     df = input_df
 
     # ------------------------------
@@ -51,21 +64,7 @@ def draw_figure(input_df):
     sector_df = df[df['Column'] == 'Target_sector'].reset_index(drop=True)
     sector_df['Subcategory'] = sector_df['Subcategory'].str.strip().str.title()
 
-    target_sector_mapping = {
-        'Government And Defense Agencies': 'Government/Defense',
-        'Corporations And Businesses': 'Corporation/Business',
-        'Financial Institutions': 'Financial',
-        'Healthcare': 'Healthcare',
-        'Energy And Utilities': 'Energy/Utility',
-        'Cloud/Iot Services': 'Cloud/IoT',
-        'Manufacturing': 'Manufacturing',
-        'Education And Research Institutions': 'Education/Research',
-        'Media And Entertainment Companies': 'Media/Entertainment',
-        'Critical Infrastructure': 'Critical',
-        'Non-Governmental Organizations (Ngos) And Nonprofits': 'NGO/Nonprofit',
-        'Individuals': 'Individual'
-    }
-    sector_df['Subcategory'] = sector_df['Subcategory'].replace(target_sector_mapping)
+    sector_df['Subcategory'] = sector_df['Subcategory'].replace(TARGET_SECTOR_MAPPING)
 
     pivot_df = sector_df.pivot(index='Year', columns='Subcategory', values='Attacks').fillna(0)
 
@@ -79,6 +78,12 @@ def draw_figure(input_df):
     ordered_columns = top_three_sectors.tolist() + remaining_sectors.tolist()
     pivot_df = pivot_df[ordered_columns]
 
+    return pivot_df
+
+# Function to get the color of each target sector column
+def build_colors(columns):
+    import seaborn as sns
+
     # ------------------------------
     # Set the color palette for each target sector
     # ------------------------------
@@ -99,7 +104,14 @@ def draw_figure(input_df):
         'NGO/Nonprofit': full_tab20[15] 
     }
 
-    colors = [color_map[sector] for sector in pivot_df.columns]
+    return [color_map[sector] for sector in columns]
+
+# Function to draw the figure, optionally with bootstrap error bars from bootstrap_trends.py
+def draw_figure(input_df, ci_df=None):
+    import matplotlib.pyplot as plt
+
+    pivot_df = build_pivot(input_df)
+    colors = build_colors(pivot_df.columns)
 
     # ------------------------------
     # Create the stacked bar plot
@@ -159,6 +171,14 @@ def draw_figure(input_df):
                 )
             cumulative_bottom += height
 
+    # ------------------------------
+    # Add the bootstrap error bars
+    # ------------------------------
+    if ci_df is not None:
+        from bootstrap_trends import draw_count_error_bars
+        ci_df = ci_df.assign(Subcategory=ci_df['Subcategory'].str.strip().str.title().replace(TARGET_SECTOR_MAPPING))
+        draw_count_error_bars(ax, pivot_df, ci_df)
+
     for spine in ax.spines.values():
         spine.set_linewidth(3) 
         spine.set_color('black')  
@@ -4,7 +4,6 @@
 
 import pandas as pd
 import numpy as np
-import altair as alt
 
 INPUT_CSV = '../Information_Retrieved_Collection.csv'
 OUTPUT_PDF = 'Figure4b_ActorChanges.pdf'
@@ -34,7 +33,7 @@ def process_filter_data(input_csv, col):
     # ------------------------------
     # Load and Prepare Data
     # ------------------------------
-    df = pd.read_csv(input_csv)
+    df = input_csv.copy() if isinstance(input_csv, pd.DataFrame) else pd.read_csv(input_csv)
 
     # Drop rows with missing 'Date' or 'Victims'
     df = df.dropna(subset=['Date', col])
@@ -95,6 +94,8 @@ def process_filter_data(input_csv, col):
 
 # Function to draw the figure
 def draw_figure(input_df):
+    import altair as alt
+
     # Load your CSV file
     df = input_df
 
@@ -0,0 +1,234 @@
+# Code to lay out the Information Retrieval Collection as a partitioned dataset
+# Reports are written as Parquet files into Hive-style Year=<year>/Source=<source> directories,
+# so readers skip the partitions a filter excludes and load only the columns they need
+
+import os
+import json
+import shutil
+import argparse
+import operator
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from urllib.parse import quote, unquote
+
+from incremental import appended_rows, digest_rows
+
+INPUT_CSV = '../Information_Retrieved_Collection.csv'
+DATASET_DIR = 'reports_dataset'
+METADATA_FILE = '_dataset.json'
+
+PARTITION_BY = ['Year', 'Source']
+# Hive's directory name for missing partition values
+DEFAULT_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+# Position of each report in the collection, so the reader returns the rows in their original order
+ROW_COLUMN = '_row'
+
+OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda value, targets: value in targets,
+    'not in': lambda value, targets: value not in targets
+}
+
+# Helper function to build the Parquet schema of the part files from the collection dtypes
+# Every part shares it, even when a text column has no value within that part
+def build_schema(dtypes):
+    return pa.schema(
+        [(col, pa.string() if dtype in ('object', 'str') else pa.from_numpy_dtype(np.dtype(dtype)))
+         for col, dtype in dtypes.items() if col not in PARTITION_BY]
+        + [(ROW_COLUMN, pa.int64())]
+    )
+
+# Helper function to build the directory of a partition
+def partition_path(year, source):
+    year = DEFAULT_PARTITION if pd.isna(year) else str(int(year))
+    source = DEFAULT_PARTITION if pd.isna(source) else quote(str(source), safe=' ')
+    return os.path.join(f'Year={year}', f'Source={source}')
+
+# Helper function to read the partition values back from the directory names
+def parse_partition(year_dir, source_dir):
+    year = year_dir.split('=', 1)[1]
+    source = source_dir.split('=', 1)[1]
+    return {
+        'Year': None if year == DEFAULT_PARTITION else int(year),
+        'Source': None if source == DEFAULT_PARTITION else unquote(source)
+    }
+
+# Helper function to evaluate one predicate; missing partition values only pass negative predicates
+def matches(value, op, target):
+    if value is None:
+        return op in ('!=', 'not in')
+    return OPERATORS[op](value, target)
+
+# Helper function to translate the filters into one pyarrow expression, evaluated inside the scan
+# Missing values only pass negative predicates, as for the partitions
+def filter_expression(filters):
+    expression = None
+    for col, op, target in filters:
+        field = ds.field(col)
+        if op in ('in', 'not in'):
+            term = field.isin(list(target))
+        else:
+            term = OPERATORS[op.replace('!=', '==')](field, target)
+        if op in ('!=', 'not in'):
+            term = ~term | field.is_null()
+        expression = term if expression is None else expression & term
+    return expression
+
+# Helper function to read the dataset metadata, None before the first write
+def read_metadata(root=DATASET_DIR):
+    path = os.path.join(root, METADATA_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+'''
+Function to write report rows into their partitions
+Every call adds at most one part file per partition, named after its content, so existing files are never rewritten
+'''
+def write_partitions(df, schema, root=DATASET_DIR):
+    years = pd.to_datetime(df['Date'], errors='coerce').dt.year
+
+    written = []
+    for (year, source), part in df.groupby([years, df['Source']], dropna=False, sort=True):
+        directory = os.path.join(root, partition_path(year, source))
+        os.makedirs(directory, exist_ok=True)
+
+        name = f"part-{digest_rows(part)[:16]}.parquet"
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            continue
+
+        # The file only appears once it is complete
+        part.drop(columns='Source').to_parquet(f'{path}.tmp', index=False, schema=schema)
+        os.replace(f'{path}.tmp', path)
+        written.append(path)
+
+    return written
+
+'''
+Function to write the collection into the dataset, appending when reports were only added
+Only the rows added since the last write become new part files; any other change rebuilds the dataset
+'''
+def write_dataset(input_csv, root=DATASET_DIR):
+    df = input_csv.copy() if isinstance(input_csv, pd.DataFrame) else pd.read_csv(input_csv)
+    metadata = read_metadata(root)
+
+    dtypes = df.dtypes.astype(str).to_dict()
+    dtypes['Year'] = 'Int64'
+
+    n_written, rows_state = appended_rows(df, metadata)
+    if n_written is None or metadata['dtypes'] != dtypes:
+        n_written = 0
+        if os.path.isdir(root):
+            for name in os.listdir(root):
+                if name.startswith('Year='):
+                    shutil.rmtree(os.path.join(root, name))
+    os.makedirs(root, exist_ok=True)
+
+    new_rows = df.iloc[n_written:].assign(**{ROW_COLUMN: np.arange(n_written, len(df))})
+    written = write_partitions(new_rows, build_schema(dtypes), root)
+
+    # ------------------------------
+    # Record what the dataset holds
+    # ------------------------------
+    metadata = {
+        **rows_state,
+        'columns': list(dtypes),
+        'dtypes': dtypes
+    }
+    tmp_path = os.path.join(root, f'{METADATA_FILE}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(metadata, f, indent=1)
+    os.replace(tmp_path, os.path.join(root, METADATA_FILE))
+
+    return len(new_rows), written
+
+'''
+Function to list the partitions that can hold rows matching the filters
+Filters are (column, op, value) predicates combined with AND; only those on Year and Source prune partitions
+'''
+def list_partitions(root=DATASET_DIR, filters=None):
+    partition_filters = [f for f in filters or [] if f[0] in PARTITION_BY]
+
+    partitions = []
+    for year_dir in sorted(os.listdir(root)):
+        if not year_dir.startswith('Year='):
+            continue
+        for source_dir in sorted(os.listdir(os.path.join(root, year_dir))):
+            values = parse_partition(year_dir, source_dir)
+            if all(matches(values[col], op, target) for col, op, target in partition_filters):
+                partitions.append((values, os.path.join(root, year_dir, source_dir)))
+
+    return partitions
+
+'''
+Function to read the dataset as the collection DataFrame, with a Year column
+Partitions excluded by the filters are never opened, the other predicates are evaluated inside the scan,
+and only the projected columns are loaded,
+e.g. read_dataset(columns=['Date', 'Attack_vector'], filters=[('Year', '>=', 2020), ('Source', '==', 'ESET')])
+'''
+def read_dataset(root=DATASET_DIR, columns=None, filters=None):
+    metadata = read_metadata(root)
+    if metadata is None:
+        raise FileNotFoundError(f'{root} is not a dataset written by partitioned_dataset.py')
+
+    filters = filters or []
+    columns = metadata['columns'] if columns is None else list(columns)
+    scan_columns = list(dict.fromkeys(columns + [ROW_COLUMN]))
+
+    # ------------------------------
+    # Load the remaining partitions
+    # ------------------------------
+    paths = [
+        os.path.join(directory, name)
+        for _, directory in list_partitions(root, filters)
+        for name in sorted(os.listdir(directory)) if name.endswith('.parquet')
+    ]
+    if not paths:
+        return pd.DataFrame({col: pd.Series(dtype=metadata['dtypes'][col]) for col in columns})
+
+    # One multithreaded scan over the files, with the partition values read from their directories
+    partition_schema = pa.schema([('Year', pa.int64()), ('Source', pa.string())])
+    dataset = ds.dataset(
+        paths,
+        schema=pa.unify_schemas([build_schema(metadata['dtypes']), partition_schema]),
+        format='parquet',
+        partitioning=ds.HivePartitioning(partition_schema, null_fallback=DEFAULT_PARTITION),
+        partition_base_dir=root
+    )
+    table = dataset.to_table(columns=scan_columns, filter=filter_expression(filters))
+    df = table.to_pandas().sort_values(ROW_COLUMN, kind='mergesort')
+
+    # ------------------------------
+    # Restore the collection dtypes
+    # ------------------------------
+    df = df[columns].reset_index(drop=True)
+    df = df.astype({col: metadata['dtypes'][col] for col in columns})
+    for col in columns:
+        # Parts without any value in a text column read back None instead of NaN
+        if metadata['dtypes'][col] == 'object':
+            df[col] = df[col].where(df[col].notna(), np.nan)
+
+    return df
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Write or inspect the Year/Source partitioned dataset')
+    parser.add_argument('--input', default=INPUT_CSV)
+    parser.add_argument('--output', default=DATASET_DIR)
+    parser.add_argument('--list', action='store_true', help='list the partitions and their part files')
+    args = parser.parse_args()
+
+    if args.list:
+        for values, directory in list_partitions(args.output):
+            print(f"Year={values['Year']} Source={values['Source']}: {len(os.listdir(directory))} part file(s)")
+    else:
+        n_rows, written = write_dataset(args.input, args.output)
+        print(f"[✓] {n_rows} reports written into {len(written)} new part files under {args.output}")
@@ -0,0 +1,171 @@
+# Code to query the three collections with SQL
+# Loads the collections and their exploded multi-value columns into an indexed SQLite database,
+# rebuilt only when a CSV changes, and opened read-only so several processes can query it at once
+
+import os
+import sys
+import sqlite3
+import hashlib
+import argparse
+import pandas as pd
+
+from malware_families import apply_families
+
+COLLECTIONS = {
+    'Threat_Actor_Collection': '../Threat_Actor_Collection.csv',
+    'Technical_Report_Collection': '../Technical_Report_Collection.csv',
+    'Information_Retrieved_Collection': '../Information_Retrieved_Collection.csv'
+}
+DATABASE = 'collections.sqlite'
+# Canonical family table written by malware_families.py, applied when present
+FAMILIES_CSV = 'Malware_Families.csv'
+
+# Multi-value columns of the Information Retrieval Collection and their separators
+EXPLODED_COLUMNS = {
+    'Threat_actor': ',',
+    'Threat_country': ';',
+    'Victim_country': ',',
+    'CVE': ',',
+    'MITRE_ID': ',',
+    'Attack_vector': ',',
+    'Malware': ',',
+    'Target_sector': ','
+}
+
+# Helper function to fingerprint the source CSVs
+def collections_digest(collections):
+    digest = hashlib.sha256()
+    for name, path in sorted(collections.items()):
+        with open(path, 'rb') as f:
+            digest.update(name.encode() + f.read())
+    if os.path.exists(FAMILIES_CSV):
+        with open(FAMILIES_CSV, 'rb') as f:
+            digest.update(b'Malware_Families' + f.read())
+    return digest.hexdigest()
+
+'''
+Function to build the database from the CSVs
+Every exploded column becomes a (report_id, value) table indexed both ways
+With the family table, the Malware column is also exploded into canonical families
+'''
+def build_database(db_path=DATABASE, collections=COLLECTIONS):
+    tmp_path = f'{db_path}.{os.getpid()}.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    con = sqlite3.connect(tmp_path)
+
+    # ------------------------------
+    # Load the collections
+    # ------------------------------
+    for name, path in collections.items():
+        df = pd.read_csv(path)
+        if name == 'Information_Retrieved_Collection':
+            df.insert(0, 'report_id', range(len(df)))
+            df['Year'] = pd.to_datetime(df['Date'], errors='coerce').dt.year.astype('Int64')
+        df.to_sql(name, con, index=False)
+
+        if name == 'Information_Retrieved_Collection':
+            con.execute(f'CREATE UNIQUE INDEX idx_reports_id ON {name} (report_id)')
+            con.execute(f'CREATE INDEX idx_reports_year ON {name} (Year)')
+            con.execute(f'CREATE INDEX idx_reports_source ON {name} (Source)')
+
+            exploded = dict(EXPLODED_COLUMNS)
+            if os.path.exists(FAMILIES_CSV):
+                families = pd.read_csv(FAMILIES_CSV)
+                families.to_sql('Malware_Families', con, index=False)
+                df['Malware_family'] = apply_families(df, families)['Malware']
+                exploded['Malware_family'] = ','
+
+            # ------------------------------
+            # Explode the multi-value columns
+            # ------------------------------
+            for col, sep in exploded.items():
+                values = df.set_index('report_id')[col].dropna().astype(str).str.replace('; ', ';').str.split(sep).explode().str.strip()
+                values = values[(values != '') & (values != 'NaN')]
+                table = f'{col}_exploded'
+                values.rename('value').reset_index().drop_duplicates().to_sql(table, con, index=False)
+                con.execute(f'CREATE INDEX idx_{table}_value ON {table} (value, report_id)')
+                con.execute(f'CREATE INDEX idx_{table}_report ON {table} (report_id, value)')
+
+        elif name == 'Threat_Actor_Collection':
+            con.execute(f'CREATE INDEX idx_actors_name ON {name} ("Threat Actor")')
+            con.execute(f'CREATE INDEX idx_actors_country ON {name} (Country)')
+
+    con.execute('CREATE TABLE _metadata (key TEXT PRIMARY KEY, value TEXT)')
+    con.execute('INSERT INTO _metadata VALUES (?, ?)', ('digest', collections_digest(collections)))
+    con.commit()
+    con.execute('ANALYZE')
+    con.close()
+
+    # Readers never see a half-built database
+    os.replace(tmp_path, db_path)
+
+# Helper function to read the digest the database was built from
+def stored_digest(db_path):
+    try:
+        con = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+        digest = con.execute("SELECT value FROM _metadata WHERE key = 'digest'").fetchone()[0]
+        con.close()
+        return digest
+    except sqlite3.Error:
+        return None
+
+'''
+Function to open a read-only connection, rebuilding the database first if the CSVs changed
+Read-only connections can be shared by any number of processes
+'''
+def connect(db_path=DATABASE, collections=COLLECTIONS, refresh=True):
+    if refresh and stored_digest(db_path) != collections_digest(collections):
+        build_database(db_path, collections)
+    con = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True, check_same_thread=False)
+    con.execute('PRAGMA query_only = ON')
+    return con
+
+'''
+Function to run a query and return a pandas DataFrame, or a pyarrow Table with as_arrow=True
+'''
+def query(sql, params=None, con=None, as_arrow=False):
+    own_connection = con is None
+    con = con or connect()
+    try:
+        df = pd.read_sql_query(sql, con, params=params)
+    finally:
+        if own_connection:
+            con.close()
+
+    if as_arrow:
+        import pyarrow as pa
+        return pa.Table.from_pandas(df, preserve_index=False)
+    return df
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Query the collections with SQL')
+    parser.add_argument('sql', nargs='?', help='query to run; tables are listed with --tables')
+    parser.add_argument('--db', default=DATABASE)
+    parser.add_argument('--format', choices=['table', 'csv', 'json'], default='table')
+    parser.add_argument('--tables', action='store_true', help='list the tables and their columns')
+    parser.add_argument('--rebuild', action='store_true', help='rebuild the database from the CSVs')
+    args = parser.parse_args()
+
+    if args.rebuild:
+        build_database(args.db)
+        print(f"[✓] Database rebuilt in {args.db}", file=sys.stderr)
+
+    con = connect(args.db)
+    if args.tables:
+        names = [row[0] for row in con.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE '\\_%' ESCAPE '\\' AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+        for name in names:
+            columns = [row[1] for row in con.execute(f'PRAGMA table_info("{name}")')]
+            print(f"{name}: {', '.join(columns)}")
+    elif args.sql:
+        result = query(args.sql, con=con)
+        if args.format == 'csv':
+            print(result.to_csv(index=False), end='')
+        elif args.format == 'json':
+            print(result.to_json(orient='records', indent=1))
+        else:
+            with pd.option_context('display.max_rows', None, 'display.width', None):
+                print(result.to_string(index=False))
+    elif not args.rebuild:
+        parser.error('a query or --tables is required')
+    con.close()